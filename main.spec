@@ -1,4 +1,6 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import zipfile
 
 
 a = Analysis(
@@ -6,7 +8,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=["wave"],
+    hiddenimports=["wav_open"],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -35,3 +37,10 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+# Pack the compiled plugins into one archive next to the executable
+plugins_path = os.path.join(SPECPATH, "source", "plugins")
+with zipfile.PyZipFile(os.path.join(DISTPATH, "plugins.zip"), "w", optimize=0) as plugins_zip:
+    for datatype in sorted(os.listdir(plugins_path)):
+        if not datatype.startswith("__"):
+            plugins_zip.writepy(os.path.join(plugins_path, datatype))
@@ -1,38 +1,187 @@
 import argparse
+import glob
 import sys
 import pathlib
 import importlib
-from types import ModuleType
-from typing import Optional
+import inspect
+import itertools
+import json
+import marshal
+import multiprocessing
+import zipfile
+from collections import deque
+from functools import partial
+from types import CodeType
+from typing import Optional, Union
 import os
+import re
 
 
-def get_plugins() -> tuple[dict[str, dict[str, ModuleType]], dict[str, dict[str, ModuleType]]]:
+# The version of the format of the manifest of the plugins
+MANIFEST_VERSION = 2
+
+# The settings of the WAV decoder tried by --hypotheses, starting with the defaults
+HYPOTHESES = {
+    "write_constant": [0x1d, 0x18, 0x24, 0x14, 0x2a, 0x30],
+    "clock": ["mean", "pll"],
+    "threshold": ["adaptive", "fixed"],
+    "invert": [False, True],
+}
+
+# The datatype that reads any data, detected only if no other datatype matches
+FALLBACK_DATATYPE = "raw"
+
+# The error of a decoding started where no program is recorded
+SYNC_ERROR = "Synchronization byte not found"
+
+
+class ConversionError(Exception):
+    def __init__(self, message: str, code: int) -> None:
+        """
+        Initialize a ConversionError object.
+
+        The error stops the conversion of one input file. A single input file
+        exits with the code, the batch mode goes on with the next file.
+
+        Args:
+            message (str): The error message.
+            code (int): The exit code, 1 for a wrong command line and 2 for a file
+                that can not be converted.
+
+        Returns:
+            None
+        """
+        super().__init__(message)
+        self.code = code
+
+
+class LazyPlugin:
+    def __init__(self, name: str, functions: list[str]) -> None:
+        """
+        Initialize a LazyPlugin object.
+
+        The module of the plugin is imported when one of its attributes is used
+        for the first time, so a conversion imports only the two plugins it uses.
+
+        Args:
+            name (str): The name of the module of the plugin, like "monitor.wav".
+            functions (list[str]): The names of the functions the plugin defines.
+
+        Returns:
+            None
+        """
+        self.__name = name
+        self.__functions = functions
+        self.__module = None
+
+    def defines(self, function: str) -> bool:
+        """
+        Checks if the plugin defines a function, without importing the plugin.
+
+        Args:
+            function (str): The name of the function.
+
+        Returns:
+            bool: True if the plugin defines the function, False otherwise.
+        """
+        return function in self.__functions
+
+    def __getattr__(self, name: str):
+        """
+        Returns an attribute of the module of the plugin, importing the module first.
+
+        Args:
+            name (str): The name of the attribute.
+
+        Returns:
+            Any: The attribute of the module.
+
+        Raises:
+            AttributeError: If the module has no such attribute.
+        """
+        # The private attributes are not looked up in the module
+        if name.startswith("_LazyPlugin__"):
+            raise AttributeError(name)
+
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return getattr(self.__module, name)
+
+
+def get_functions(source: bytes, compiled: bool = False) -> list[str]:
     """
-    Get plugins from the 'plugins' directory in the current directory.
+    Finds the functions a plugin defines without importing it.
+
+    Args:
+        source (bytes): The source file of the plugin, or its compiled module.
+        compiled (bool, optional): True if the source is a compiled module (.pyc).
+            Defaults to False.
 
     Returns:
-        Tuple of two dictionaries: plugins_input and plugins_output.
-        Each dictionary has the following structure:
-        {
-            datatype_name: {
-                plugin_name: plugin_module
-            }
-        }
+        list[str]: The names of the functions defined at the top level of the plugin.
     """
-    # Get the path to the 'plugins' directory
-    if getattr(sys, "frozen", False):
-        app_path = pathlib.Path(sys.executable).parent / "plugins"
-    elif __file__:
-        app_path = pathlib.Path(__file__).parent / "plugins"
+    if compiled:
+        # The functions of a module are the code objects among its constants,
+        # the code of the module follows the header of 16 bytes
+        code = marshal.loads(source[16:])
+        return [const.co_name for const in code.co_consts if isinstance(const, CodeType)]
+    return re.findall(r"^def (\w+)\(", source.decode("utf-8"), re.MULTILINE)
 
-    # Add the 'plugins' directory to the system path
-    sys.path.append(str(app_path))
 
-    # Create dictionaries to store plugins
+def find_zip_plugins(zip_path: pathlib.Path) -> tuple[dict[str, dict[str, list[str]]], dict[str, int]]:
+    """
+    Finds the plugins in the plugins.zip archive.
+
+    The archive has the same layout as the 'plugins' directory, with the source
+    files or the compiled modules of the datatypes and the formats.
+
+    Args:
+        zip_path (pathlib.Path): The path to the archive.
+
+    Returns:
+        tuple: The functions of every plugin by the datatype and the format, and the
+            modification time of the archive by its name.
+    """
     plugins = {}
-    plugins_input = {}
-    plugins_output = {}
+    with zipfile.ZipFile(zip_path) as f:
+        for name in f.namelist():
+            parts = name.split("/")
+            suffix = pathlib.PurePosixPath(name).suffix
+
+            # Skip the files that are not modules and the modules starting with '__'
+            # other than the packages of the datatypes and the formats
+            if suffix not in (".py", ".pyc") or parts[0].startswith("__"):
+                continue
+            if len(parts) == 2 and parts[1].startswith("__init__."):
+                plugins.setdefault(parts[0], {})
+                continue
+            if len(parts) == 3 and parts[2].startswith("__init__."):
+                plugin_name = parts[1]
+            elif len(parts) == 2 and not parts[1].startswith("__"):
+                plugin_name = pathlib.PurePosixPath(parts[1]).stem
+            else:
+                continue
+
+            # Read the functions from the source file or the compiled module of the plugin
+            plugins.setdefault(parts[0], {})[plugin_name] = get_functions(f.read(name), suffix == ".pyc")
+
+    return plugins, {zip_path.name: os.stat(zip_path).st_mtime_ns}
+
+
+def find_plugins(app_path: pathlib.Path) -> tuple[dict[str, dict[str, list[str]]], dict[str, int]]:
+    """
+    Finds the plugins in the directory tree of the 'plugins' directory.
+
+    Args:
+        app_path (pathlib.Path): The path to the 'plugins' directory.
+
+    Returns:
+        tuple: The functions of every plugin by the datatype and the format, and the
+            modification times of the directories and the source files of the plugins
+            by their paths relative to the directory of the 'plugins' directory.
+    """
+    plugins = {}
+    mtimes = {app_path.name: os.stat(app_path).st_mtime_ns}
 
     # Loop through all files and directories in the 'plugins' directory
     for i in os.listdir(app_path):
@@ -45,8 +194,7 @@ def get_plugins() -> tuple[dict[str, dict[str, ModuleType]], dict[str, dict[str,
 
         # Create a dictionary for the current datatype
         plugins[datatype_name] = {}
-        plugins_input[datatype_name] = {}
-        plugins_output[datatype_name] = {}
+        mtimes[f"{app_path.name}/{i}"] = os.stat(datatype_path).st_mtime_ns
 
         # Loop through all files and directories in the current datatype directory
         for j in os.listdir(datatype_path):
@@ -57,44 +205,218 @@ def get_plugins() -> tuple[dict[str, dict[str, ModuleType]], dict[str, dict[str,
             if plugin_name.startswith("__"):
                 continue
 
-            # Import the module and add it to the plugins dictionary
-            plugins[datatype_name][plugin_name] = importlib.import_module(
-                f"{datatype_name}.{plugin_name}")
+            # Read the functions from the source file of the plugin
+            source_path = plugin_file / "__init__.py" if plugin_file.is_dir() else plugin_file
+            with open(source_path, "rb") as f:
+                plugins[datatype_name][plugin_name] = get_functions(f.read())
+            mtimes[source_path.relative_to(app_path.parent).as_posix()] = os.stat(source_path).st_mtime_ns
+
+    return plugins, mtimes
+
+
+def read_manifest(manifest_path: pathlib.Path, app_path: pathlib.Path) -> Optional[dict[str, dict[str, list[str]]]]:
+    """
+    Reads the plugins from the manifest if none of the plugins changed since it was written.
+
+    A plugin that is added or removed changes the modification time of its
+    directory, and a plugin that is edited changes the time of its source file.
+    The plugins in an archive are checked by the time of the archive.
+
+    Args:
+        manifest_path (pathlib.Path): The path to the manifest.
+        app_path (pathlib.Path): The path to the 'plugins' directory or the archive.
+
+    Returns:
+        dict or None: The functions of every plugin by the datatype and the format,
+            or None if there is no valid manifest.
+    """
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        # The manifest of another version or of the other place of the plugins is written again
+        if manifest.get("version") != MANIFEST_VERSION or app_path.name not in manifest["mtimes"]:
+            return None
+
+        # Compare the modification times of the directories and the source files
+        for path, mtime in manifest["mtimes"].items():
+            if os.stat(app_path.parent / path).st_mtime_ns != mtime:
+                return None
+        return manifest["plugins"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def write_manifest(manifest_path: pathlib.Path, plugins: dict[str, dict[str, list[str]]], mtimes: dict[str, int]) -> None:
+    """
+    Writes the manifest of the plugins, if the directory of the manifest is writable.
+
+    The manifest is written to a temporary file first and then renamed, so the
+    converters started at the same time never read a half-written manifest.
+
+    Args:
+        manifest_path (pathlib.Path): The path to the manifest.
+        plugins (dict): The functions of every plugin by the datatype and the format.
+        mtimes (dict): The modification times of the directories and the source files.
+    """
+    temporary_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}")
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "mtimes": mtimes, "plugins": plugins}, f)
+        os.replace(temporary_path, manifest_path)
+    except OSError:
+        # Work without the manifest, like from a read-only directory
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+def get_plugins() -> tuple[dict[str, dict[str, LazyPlugin]], dict[str, dict[str, LazyPlugin]]]:
+    """
+    Get plugins from the 'plugins' directory in the current directory.
+
+    The plugins are found by the names of their directories and the functions
+    they define, and they are imported only when they are used. What is found
+    is kept in the manifest plugins.json next to the 'plugins' directory, so
+    the next start reads one file and checks the times of the plugins instead
+    of reading the directory tree.
+
+    The plugins can also be packed into the plugins.zip archive next to the
+    'plugins' directory, which is used instead of the directory and imported
+    by zipimport, so the start opens one file instead of many small ones.
+
+    Returns:
+        Tuple of two dictionaries: plugins_input and plugins_output.
+        Each dictionary has the following structure:
+        {
+            datatype_name: {
+                plugin_name: LazyPlugin
+            }
+        }
+    """
+    # Get the path to the 'plugins' directory
+    if getattr(sys, "frozen", False):
+        app_path = pathlib.Path(sys.executable).parent / "plugins"
+    elif __file__:
+        app_path = pathlib.Path(__file__).parent / "plugins"
+
+    # Use the archive of the plugins if there is one
+    zip_path = app_path.with_name("plugins.zip")
+    if zip_path.is_file():
+        app_path = zip_path
+
+    # Add the 'plugins' directory or the archive to the system path
+    sys.path.append(str(app_path))
+
+    # Read the plugins from the manifest, or find them and write the manifest
+    manifest_path = app_path.with_name("plugins.json")
+    plugins = read_manifest(manifest_path, app_path)
+    if plugins is None:
+        if app_path == zip_path:
+            plugins, mtimes = find_zip_plugins(app_path)
+        else:
+            plugins, mtimes = find_plugins(app_path)
+        write_manifest(manifest_path, plugins, mtimes)
+
+    # Create dictionaries to store plugins
+    plugins_input = {}
+    plugins_output = {}
+    for datatype_name, formats in plugins.items():
+        plugins_input[datatype_name] = {}
+        plugins_output[datatype_name] = {}
+        for plugin_name, functions in formats.items():
             # Check if the plugin has an input and output function
-            plugin = plugins[datatype_name][plugin_name]
-            if plugin.input is not None:
+            plugin = LazyPlugin(f"{datatype_name}.{plugin_name}", functions)
+            if "input" in functions:
                 plugins_input[datatype_name][plugin_name] = plugin
-            if plugin.output is not None:
+            if "output" in functions:
                 plugins_output[datatype_name][plugin_name] = plugin
 
     # Return the dictionaries with plugins
     return plugins_input, plugins_output
 
 
-def get_args(plugins_input: dict[str, dict[str, ModuleType]], plugins_output: dict[str, dict[str, ModuleType]]) -> tuple[str, str, str, str, str]:
+def integer(value: str) -> int:
+    """
+    Parses an integer from the command line in decimal or with a 0x prefix in hexadecimal.
+
+    Args:
+        value (str): The value from the command line.
+
+    Returns:
+        int: The parsed integer.
+    """
+    return int(value, 0)
+
+
+def integers(value: str) -> list[int]:
+    """
+    Parses a comma-separated list of integers from the command line.
+
+    Args:
+        value (str): The value from the command line.
+
+    Returns:
+        list[int]: The parsed integers.
+    """
+    return [integer(item) for item in value.split(",")]
+
+
+def get_args(plugins_input: dict[str, dict[str, LazyPlugin]], plugins_output: dict[str, dict[str, LazyPlugin]]) -> argparse.Namespace:
     """
-    This function parses command line arguments and returns the datatype, input path, input format, output path, and output format.
+    This function parses command line arguments and checks the arguments that do not depend on the input files.
 
     Args:
         plugins_input (dict): A dictionary containing information about the input plugins.
         plugins_output (dict): A dictionary containing information about the output plugins.
 
     Returns:
-        tuple: A tuple containing the datatype, input path, input format, output path, and output format.
+        argparse.Namespace: The parsed arguments, with the batch flag set if several input files are converted.
     """
     # Create the argument parser
     args = argparse.ArgumentParser()
 
     # Add arguments to the parser
-    args.add_argument("-i", "--input", type=str, help="input file")
+    args.add_argument("-i", "--input", type=str, nargs="+",
+                      help="input file, several files, directories or patterns like '*.gam' are converted in the batch mode")
     args.add_argument("-dt", "--datatype", type=str,
-                      help="datatype", choices=plugins_input.keys())
+                      help="datatype, detected from the input file if not given", choices=plugins_input.keys())
     args.add_argument("-if", "--input-format", type=str,
-                      help="input format")
+                      help="input format, detected from the input file if not given by the extension")
     args.add_argument("-of", "--output-format", type=str,
                       help="output format")
-    args.add_argument("-o", "--output", type=str, help="output file")
+    args.add_argument("-o", "--output", type=str, help="output file, - for the standard output")
+    args.add_argument("-O", "--output-dir", type=str,
+                      help="output directory of the batch mode (default next to the input files)")
+    args.add_argument("-n", "--name", type=str, default="{stem}.{format}",
+                      help="name of the output files of the batch mode with the fields {stem}, {datatype}, "
+                           "{input_format} and {format} (default {stem}.{format})")
     args.add_argument("-l", "--list", action="store_true", help="list plugins")
+    args.add_argument("-p", "--probe", action="store_true",
+                      help="print the header of the input file without reading the data")
+    args.add_argument("-e", "--engine", type=str, help="wav decoding and encoding engine",
+                      choices=["python", "numpy"])
+    args.add_argument("-w", "--write-constant", type=integer,
+                      help="tape speed constant of the monitor for reading and writing wav files (default 0x1D)")
+    args.add_argument("-r", "--rate", type=integers,
+                      help="sample rate of the output wav file (default 44100), several comma-separated "
+                           "rates write one file for every rate as OUTPUT_RATE")
+    args.add_argument("-a", "--amplitude", type=integer,
+                      help="amplitude of the output wav file from 1 to 0x7F (default 0x60)")
+    args.add_argument("-c", "--channel", type=str,
+                      help="wav channel: left, right, sum, auto or its number")
+    args.add_argument("--clock", type=str, help="wav half-bit clock recovery",
+                      choices=["mean", "pll"])
+    args.add_argument("-s", "--scan", action="store_true",
+                      help="find all programs in the input file and write each to its own output file")
+    args.add_argument("--stats", action="store_true",
+                      help="write the statistics of the wav decoding next to the output file as OUTPUT.json")
+    args.add_argument("-H", "--hypotheses", action="store_true",
+                      help="try the settings of the wav decoder in parallel until the checksum matches")
+    args.add_argument("-j", "--jobs", type=int,
+                      help="number of processes for --scan and --hypotheses (default the number of cores) "
+                           "and for long wav recordings (default 1)")
 
     # Parse the arguments
     args = args.parse_args()
@@ -104,35 +426,172 @@ def get_args(plugins_input: dict[str, dict[str, ModuleType]], plugins_output: di
         print_plugins(plugins_input, plugins_output)
         sys.exit(0)
 
-    # Get the datatype from the command line arguments
-    datatype = args.datatype
-
     # If the input file is not specified, print an error message and exit
     if args.input is None:
         print("Input file not found")
         sys.exit(1)
 
-    # Get the absolute path of the input file
-    input_path = pathlib.Path(args.input).absolute()
+    # Several files, a directory or a pattern are converted in the batch mode
+    args.batch = args.output_dir is not None or len(args.input) > 1 or any(
+        has_pattern(pattern) or os.path.isdir(pattern) for pattern in args.input)
+    if args.batch and args.output is not None:
+        print("The --output option can not be used with several input files, use --output-dir")
+        sys.exit(1)
+    if args.batch and args.output_format is None and not args.probe:
+        print("Output format is required for several input files")
+        sys.exit(1)
 
-    # If the input file does not exist, print an error message and exit
-    if not input_path.exists():
-        print(f"Input file not found: {args.input}")
+    # If several modes are selected, print an error message and exit
+    if args.probe + args.scan + args.hypotheses > 1:
+        print("The --probe, --scan and --hypotheses modes can not be combined")
+        sys.exit(1)
+
+    # Only the output file can be written to the standard output
+    if args.output == "-" and (args.scan or args.stats or args.hypotheses):
+        print("The standard output can not be used with --scan, --stats and --hypotheses")
         sys.exit(1)
+    if args.output == "-" and args.rate is not None and len(args.rate) > 1:
+        print("The standard output can not be used with several sample rates")
+        sys.exit(1)
+
+    # If the number of processes is not positive, print an error message and exit
+    if args.jobs is not None and args.jobs < 1:
+        print(f"Invalid number of jobs: {args.jobs}")
+        sys.exit(1)
+
+    return args
+
+
+def has_pattern(pattern: str) -> bool:
+    """
+    This function checks if an input path is a pattern of file names.
+
+    Args:
+        pattern (str): The input path from the command line arguments.
+
+    Returns:
+        bool: True if the path has the wildcards *, ? or [, False otherwise.
+    """
+    return any(char in pattern for char in "*?[")
+
+
+def get_inputs(patterns: list[str]) -> list[tuple[pathlib.Path, pathlib.Path]]:
+    """
+    This function finds the input files of the batch mode.
+
+    A directory is searched recursively and a pattern may contain ** for any
+    subdirectory. Every file gets its path relative to the directory or to the
+    part of the pattern before the wildcards, which is kept in the output directory.
+
+    Args:
+        patterns (list[str]): The input files, directories and patterns from the command line arguments.
+
+    Returns:
+        list[tuple[pathlib.Path, pathlib.Path]]: The absolute paths of the input files and their relative paths.
+    """
+    inputs = []
+    for pattern in patterns:
+        if has_pattern(pattern):
+            # The files are relative to the directory before the first wildcard
+            base = pathlib.Path()
+            for part in pathlib.Path(pattern).parts[:-1]:
+                if has_pattern(part):
+                    break
+                base /= part
+            paths = [pathlib.Path(name) for name in sorted(glob.glob(pattern, recursive=True))]
+            inputs += [(path.absolute(), path.relative_to(base)) for path in paths if path.is_file()]
+        elif os.path.isdir(pattern):
+            # The files of the directory and its subdirectories
+            paths = sorted(pathlib.Path(pattern).rglob("*"))
+            inputs += [(path.absolute(), path.relative_to(pattern)) for path in paths if path.is_file()]
+        else:
+            inputs.append((pathlib.Path(pattern).absolute(), pathlib.Path(pathlib.Path(pattern).name)))
+    return inputs
+
+
+def get_input_info(args: argparse.Namespace, plugins_input: dict[str, dict[str, LazyPlugin]], input_path: pathlib.Path) -> tuple[str, str]:
+    """
+    This function returns the datatype and the input format of an input file.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        input_path (pathlib.Path): The absolute path to the input file.
+
+    Returns:
+        tuple: The datatype and the input format.
+    """
+    # If the input file does not exist, raise an error
+    if not input_path.exists():
+        raise ConversionError(f"Input file not found: {input_path}", 1)
+
+    # Get the datatype from the command line arguments
+    datatype = args.datatype
 
-    # Get the input format from the command line arguments or the file extension
-    input_format = get_format(
-        args.input_format, input_path, plugins_input[datatype])
+    # Get the input format from the command line arguments or the file extension,
+    # or detect the datatype and the input format from the contents of the input file
+    if datatype is not None and (args.input_format is not None or input_path.suffix[1:] in plugins_input[datatype]):
+        input_format = get_format(
+            args.input_format, input_path, plugins_input[datatype])
+    else:
+        datatype, input_format = detect(plugins_input, input_path, datatype, args.input_format)
 
-    # Get the output path and format from the command line arguments or the input path and format
-    output_path, output_format = get_output_info(
-        args.output, args.output_format, input_path, plugins_output[datatype])
+    return datatype, input_format
 
-    # Return the datatype, input path, input format, output path, and output format
-    return datatype, input_path, input_format, output_path, output_format
 
+def get_options(args: argparse.Namespace, plugins_input: dict[str, dict[str, LazyPlugin]], plugins_output: dict[str, dict[str, LazyPlugin]], datatype: str, input_format: str, output_format: Optional[str]) -> tuple[dict, dict]:
+    """
+    This function collects the options for the input and the output plugins that are set on the command line.
 
-def print_plugins(plugins_input: dict[str, dict[str, ModuleType]], plugins_output: dict[str, dict[str, ModuleType]]) -> None:
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        plugins_output (dict): A dictionary containing information about the output plugins.
+        datatype (str): The datatype.
+        input_format (str): The input format.
+        output_format (str): The output format, None if there is no output file.
+
+    Returns:
+        tuple: The input and the output options.
+    """
+    input_options = {}
+    output_options = {}
+
+    # The engine and the write constant apply to both sides that are tape recordings
+    shared_options = {}
+    if args.engine is not None:
+        shared_options["engine"] = args.engine
+    if args.write_constant is not None:
+        shared_options["write_constant"] = args.write_constant
+    if shared_options:
+        tape_input = accepts_options(plugins_input[datatype][input_format].input)
+        tape_output = output_format is not None and accepts_options(
+            plugins_output[datatype][output_format].output)
+        if not tape_input and not tape_output:
+            raise ConversionError("The --engine and --write-constant options need a wav input or output format", 1)
+        if tape_input:
+            input_options.update(shared_options)
+        if tape_output:
+            output_options.update(shared_options)
+
+    if args.channel is not None:
+        input_options["channel"] = args.channel
+    if args.clock is not None:
+        input_options["clock"] = args.clock
+    if args.rate is not None:
+        output_options["frequency"] = args.rate[0] if len(args.rate) == 1 else args.rate
+    if args.amplitude is not None:
+        output_options["amplitude"] = args.amplitude
+
+    # The processes synthesize long recordings of the formats that take options, if they are asked for
+    if args.jobs is not None and args.jobs > 1 and output_format is not None and accepts_options(
+            plugins_output[datatype][output_format].output):
+        output_options["jobs"] = args.jobs
+
+    return input_options, output_options
+
+
+def print_plugins(plugins_input: dict[str, dict[str, LazyPlugin]], plugins_output: dict[str, dict[str, LazyPlugin]]) -> None:
     """
     This function prints a table of input and output plugins for each datatype.
 
@@ -174,7 +633,7 @@ def print_plugins(plugins_input: dict[str, dict[str, ModuleType]], plugins_outpu
     print("└───────────────┴───────────────┘")
 
 
-def get_format(input_format: Optional[str], input_path: pathlib.Path, input_plugins: dict[str, ModuleType]) -> str:
+def get_format(input_format: Optional[str], input_path: pathlib.Path, input_plugins: dict[str, LazyPlugin]) -> str:
     """
     This function returns the input format from the command line arguments or the file extension.
 
@@ -197,12 +656,62 @@ def get_format(input_format: Optional[str], input_path: pathlib.Path, input_plug
     if suffix in input_plugins:
         return suffix
 
-    # If the file extension is not in the input plugins, print an error message and exit
-    print(f"Input format not found: {suffix}")
-    sys.exit(1)
+    # If the file extension is not in the input plugins, raise an error
+    raise ConversionError(f"Input format not found: {suffix}", 1)
+
+
+def detect(plugins_input: dict[str, dict[str, LazyPlugin]], input_path: pathlib.Path, datatype: Optional[str], input_format: Optional[str]) -> tuple[str, str]:
+    """
+    This function detects the datatype and the input format from the contents of the input file.
+
+    Every input plugin with a detect function scores the file from 0 to 100, and
+    the plugin with the highest score is chosen. A plugin without a detect function
+    scores 1 if the extension of the file is its format, and the extension decides
+    between equal scores. The plugins that score 0 do not match, so a file that the
+    plugins of its extension can not read is not detected. The fallback datatype is
+    chosen only if it is given or no other datatype matches.
+
+    Args:
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        input_path (pathlib.Path): The path to the input file.
+        datatype (str): The datatype from the command line arguments, None to detect it.
+        input_format (str): The input format from the command line arguments, None to detect it.
+
+    Returns:
+        tuple: The datatype and the input format.
+    """
+    suffix = input_path.suffix[1:]
+
+    # Score the plugins of the given datatype and format
+    candidates = []
+    for datatype_name, formats in plugins_input.items():
+        if datatype is not None and datatype_name != datatype:
+            continue
+        for format_name, plugin in formats.items():
+            if input_format is not None and format_name != input_format:
+                continue
+            score = plugin.detect(input_path) if plugin.defines("detect") else int(format_name == suffix)
+            if score > 0:
+                candidates.append((score, format_name == suffix, datatype_name, format_name))
+
+    # Drop the fallback datatype if any other datatype matches
+    if any(candidate[2] != FALLBACK_DATATYPE for candidate in candidates):
+        candidates = [candidate for candidate in candidates if candidate[2] != FALLBACK_DATATYPE]
+
+    # If no plugin matches, raise an error
+    if not candidates:
+        raise ConversionError(f"Input format not detected: {input_path.name}", 1)
 
+    # If several plugins match equally well, raise an error
+    candidates.sort(key=lambda candidate: candidate[:2], reverse=True)
+    best = [candidate for candidate in candidates if candidate[:2] == candidates[0][:2]]
+    if len(best) > 1:
+        raise ConversionError(f"Input file matches several formats: {', '.join(f'{c[2]}/{c[3]}' for c in best)}", 1)
 
-def get_output_info(output: Optional[str], output_format: Optional[str], input_path: pathlib.Path, output_plugins: dict[str, ModuleType]) -> tuple[pathlib.Path, str]:
+    return best[0][2], best[0][3]
+
+
+def get_output_info(output: Optional[str], output_format: Optional[str], input_path: pathlib.Path, output_plugins: dict[str, LazyPlugin]) -> tuple[Union[pathlib.Path, int], str]:
     """
     This function returns the output path and format from the command line arguments or the input path and format.
 
@@ -214,8 +723,15 @@ def get_output_info(output: Optional[str], output_format: Optional[str], input_p
         output_plugins (dict): A dictionary containing information about the output plugins.
 
     Returns:
-        tuple: A tuple containing the output path and format.
+        tuple: A tuple containing the output path and format. The output path is the descriptor
+            of the standard output for "-", the plugins open it like a path.
     """
+    # The output to the standard output has no extension to get the format from
+    if output == "-":
+        if output_format is None:
+            raise ConversionError("Output format is required for the standard output", 1)
+        return sys.stdout.fileno(), output_format
+
     # If the output path is specified, return it
     if output is not None:
         output_path = pathlib.Path(output).absolute()
@@ -227,7 +743,21 @@ def get_output_info(output: Optional[str], output_format: Optional[str], input_p
     return output_path, output_format
 
 
-def read(plugins_input: dict[str, dict[str, ModuleType]], input_path: pathlib.Path, datatype: str, input_format: str):
+def accepts_options(function) -> bool:
+    """
+    This function checks if a plugin function accepts keyword options.
+
+    Args:
+        function (Callable): The input or output function of a plugin.
+
+    Returns:
+        bool: True if the function accepts keyword options, False otherwise.
+    """
+    return any(parameter.kind == inspect.Parameter.VAR_KEYWORD
+               for parameter in inspect.signature(function).parameters.values())
+
+
+def read(plugins_input: dict[str, dict[str, LazyPlugin]], input_path: pathlib.Path, datatype: str, input_format: str, input_options: Optional[dict] = None):
     """
     Reads data from the input file using the specified plugin and format.
 
@@ -236,6 +766,7 @@ def read(plugins_input: dict[str, dict[str, ModuleType]], input_path: pathlib.Pa
         input_path (pathlib.Path): The path to the input file.
         datatype (str): The datatype.
         input_format (str): The input format.
+        input_options (dict, optional): Keyword options passed to the plugin.
 
     Returns:
         Data: The data read from the input file.
@@ -246,33 +777,402 @@ def read(plugins_input: dict[str, dict[str, ModuleType]], input_path: pathlib.Pa
     # Get the plugin for the specified datatype and input format
     plugin = plugins_input[datatype][input_format]
 
+    # If the plugin does not accept the options, raise an error
+    input_options = input_options or {}
+    if input_options and not accepts_options(plugin.input):
+        raise ConversionError(f"Options are not supported by the input format: {input_format}", 1)
+
     try:
         # Read the data from the input file using the plugin
-        data = plugin.input(input_path)
+        data = plugin.input(input_path, **input_options)
     except ValueError as e:
-        # If there is an error reading the input file, print the error message and exit
-        print(e)
-        sys.exit(2)
+        # If there is an error reading the input file, raise it as the error of the conversion
+        raise ConversionError(str(e), 2)
 
     return data
 
 
-def write(plugins_output: dict[str, dict[str, ModuleType]], output_path: pathlib.Path, datatype: str, output_format: str, data) -> None:
+def probe(plugins_input: dict[str, dict[str, LazyPlugin]], input_path: pathlib.Path, datatype: str, input_format: str, input_options: dict) -> None:
+    """
+    Prints the header of the input file using the specified plugin and format.
+
+    Args:
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        input_path (pathlib.Path): The path to the input file.
+        datatype (str): The datatype.
+        input_format (str): The input format.
+        input_options (dict): Keyword options passed to the plugin.
+    """
+    # Get the plugin for the specified datatype and input format
+    plugin = plugins_input[datatype][input_format]
+
+    # If the plugin can not read the header, raise an error
+    if getattr(plugin, "probe", None) is None:
+        raise ConversionError(f"Probing is not supported by the input format: {input_format}", 1)
+    if input_options and not accepts_options(plugin.probe):
+        raise ConversionError(f"Options are not supported by the input format: {input_format}", 1)
+
+    try:
+        # Read the header from the input file using the plugin
+        header = plugin.probe(input_path, **input_options)
+    except ValueError as e:
+        # If there is an error reading the input file, raise it as the error of the conversion
+        raise ConversionError(str(e), 2)
+
+    # Print the fields of the header, the numbers in hexadecimal
+    print(" ".join(f"{key}={value:04X}" if isinstance(value, int) else f"{key}={value}"
+                   for key, value in header.items()))
+
+
+def write(plugins_output: dict[str, dict[str, LazyPlugin]], output_path: Union[pathlib.Path, int], datatype: str, output_format: str, data, output_options: Optional[dict] = None) -> None:
     """
     Writes data to the output file using the specified plugin and format.
 
     Args:
         plugins_output (dict): A dictionary containing information about the output plugins.
-        output_path (pathlib.Path): The path to the output file.
+        output_path (pathlib.Path or int): The path to the output file, or the descriptor of the standard output.
         datatype (str): The datatype.
         output_format (str): The output format.
         data (Data): The data to write to the output file.
+        output_options (dict, optional): Keyword options passed to the plugin.
     """
     # Get the plugin for the specified datatype and output format
     plugin = plugins_output[datatype][output_format]
 
-    # Write the data to the output file using the plugin
-    plugin.output(output_path, data)
+    # If the plugin does not accept the options, raise an error
+    output_options = output_options or {}
+    if output_options and not accepts_options(plugin.output):
+        raise ConversionError(f"Options are not supported by the output format: {output_format}", 1)
+
+    try:
+        # Write the data to the output file using the plugin
+        plugin.output(output_path, data, **output_options)
+    except ValueError as e:
+        # If the options are invalid, raise it as the error of the conversion
+        raise ConversionError(str(e), 2)
+    except BrokenPipeError:
+        # If the reader of the standard output has closed it, drop the rest of the output and exit quietly
+        if not isinstance(output_path, int):
+            raise
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, output_path)
+        sys.exit(1)
+
+
+def read_program(datatype: str, input_format: str, input_path: pathlib.Path, input_options: dict) -> tuple:
+    """
+    Reads one program from the input file in a worker process.
+
+    Args:
+        datatype (str): The datatype.
+        input_format (str): The input format.
+        input_path (pathlib.Path): The path to the input file.
+        input_options (dict): Keyword options passed to the plugin.
+
+    Returns:
+        tuple: The data read from the input file, the statistics of the decoding,
+            and the error message. The data and the statistics are None if there
+            is an error.
+    """
+    # The worker process imports the plugin by itself
+    plugin = importlib.import_module(f"{datatype}.{input_format}")
+
+    report = {}
+    try:
+        data = plugin.input(input_path, report=report, **input_options)
+    except ValueError as e:
+        return None, None, str(e)
+    return data, report, None
+
+
+def get_program_path(output_path: pathlib.Path, index: int, data) -> pathlib.Path:
+    """
+    Returns the path to the output file of a program found by the scan.
+
+    Args:
+        output_path (pathlib.Path): The path to the output file.
+        index (int): The number of the program in the input file, starting from 1.
+        data (Data): The data of the program.
+
+    Returns:
+        pathlib.Path: The output path with the number and the name of the program added to its stem.
+    """
+    # Use the letters and digits of the name in the header, if there is one
+    name = "".join(filter(str.isalnum, getattr(data, "name", b"").decode("ascii", "ignore")))
+    stem = f"{output_path.stem}_{index:02}"
+    if name:
+        stem += f"_{name}"
+    return output_path.with_stem(stem)
+
+
+def write_stats(output_path: pathlib.Path, stats: dict) -> None:
+    """
+    Writes the statistics of the decoding next to the output file.
+
+    Args:
+        output_path (pathlib.Path): The path to the output file.
+        stats (dict): The statistics of the decoding.
+    """
+    with open(output_path.with_name(f"{output_path.name}.json"), "w") as f:
+        json.dump(stats, f)
+
+
+def scan(plugins_input: dict[str, dict[str, LazyPlugin]], plugins_output: dict[str, dict[str, LazyPlugin]], input_path: pathlib.Path, datatype: str, input_format: str, output_path: pathlib.Path, output_format: str, input_options: dict, output_options: dict, jobs: int, stats: bool = False) -> None:
+    """
+    Finds all programs in the input file and writes each of them to its own output file.
+
+    The positions where a program may start are found first. Then the programs
+    are read from these positions in a pool of processes, and the leaders that end
+    inside the programs that are already read or are not followed by the
+    synchronization byte are skipped.
+
+    Args:
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        plugins_output (dict): A dictionary containing information about the output plugins.
+        input_path (pathlib.Path): The path to the input file.
+        datatype (str): The datatype.
+        input_format (str): The input format.
+        output_path (pathlib.Path): The path to the output file.
+        output_format (str): The output format.
+        input_options (dict): Keyword options passed to the input plugin.
+        output_options (dict): Keyword options passed to the output plugin.
+        jobs (int): The number of processes.
+        stats (bool, optional): Whether to write the statistics of the decoding of every program.
+    """
+    # Get the plugin for the specified datatype and input format
+    plugin = plugins_input[datatype][input_format]
+
+    # If the plugin can not find programs, raise an error
+    if getattr(plugin, "scan", None) is None:
+        raise ConversionError(f"Scanning is not supported by the input format: {input_format}", 1)
+
+    try:
+        # Find the positions where a program may start
+        offsets = iter(plugin.scan(input_path, **input_options))
+    except ValueError as e:
+        raise ConversionError(str(e), 2)
+
+    end = 0
+    count = 0
+    pending = deque()
+    with multiprocessing.Pool(jobs) as pool:
+        while True:
+            # Keep every process busy with the positions after the programs read so far
+            while len(pending) < jobs and (leader := next(offsets, None)) is not None:
+                offset, sync = leader
+                if sync >= end:
+                    pending.append((offset, sync, pool.apply_async(
+                        read_program, (datatype, input_format, input_path, {**input_options, "offset": offset}))))
+            if not pending:
+                break
+
+            # Take the results in the order of the positions
+            offset, sync, result = pending.popleft()
+            try:
+                data, report, error = result.get()
+            except Exception as e:
+                # Report an unexpected error of the worker with the program
+                data, report, error = None, None, f"{type(e).__name__}: {e}"
+
+            # Skip the leaders inside the programs that are already read, and the ones without a program
+            if sync < end or error == SYNC_ERROR:
+                continue
+            if error is not None:
+                print(f"{offset}: {error}")
+                continue
+
+            # Write the program to its own output file
+            end = report["end"]
+            count += 1
+            program_path = get_program_path(output_path, count, data)
+            write(plugins_output, program_path, datatype, output_format, data, output_options)
+            if stats:
+                write_stats(program_path, report)
+            print(f"{offset}: {program_path.name}")
+
+    # If no program is read, raise an error
+    if not count:
+        raise ConversionError("Programs not found", 2)
+
+
+def read_hypothesis(datatype: str, input_format: str, input_path: pathlib.Path, input_options: dict, hypothesis: tuple[int, dict]) -> tuple:
+    """
+    Reads the input file with one of the settings tried by --hypotheses in a worker process.
+
+    Args:
+        datatype (str): The datatype.
+        input_format (str): The input format.
+        input_path (pathlib.Path): The path to the input file.
+        input_options (dict): Keyword options passed to the plugin.
+        hypothesis (tuple): The number of the settings and the settings.
+
+    Returns:
+        tuple: The number of the settings followed by the result of read_program.
+    """
+    index, settings = hypothesis
+    return (index,) + read_program(datatype, input_format, input_path, {**input_options, **settings})
+
+
+def search(plugins_input: dict[str, dict[str, LazyPlugin]], input_path: pathlib.Path, datatype: str, input_format: str, input_options: dict, jobs: int) -> tuple:
+    """
+    Reads data from the input file trying the settings of the decoder in a pool of processes.
+
+    The settings that are not set on the command line are taken from HYPOTHESES.
+    The results are taken in the order of the settings, so the first settings
+    that read the file without an error win whichever process finishes first,
+    and the other processes are stopped. The datatypes that have a checksum
+    verify it, the other ones are read with the first settings that decode them.
+
+    Args:
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        input_path (pathlib.Path): The path to the input file.
+        datatype (str): The datatype.
+        input_format (str): The input format.
+        input_options (dict): Keyword options passed to the plugin.
+        jobs (int): The number of processes.
+
+    Returns:
+        tuple: The data read from the input file and the statistics of the decoding.
+    """
+    # If the plugin does not accept the settings, raise an error
+    if not accepts_options(plugins_input[datatype][input_format].input):
+        raise ConversionError(f"Options are not supported by the input format: {input_format}", 1)
+
+    # Combine the values of the settings that are not set on the command line
+    keys = [key for key in HYPOTHESES if key not in input_options]
+    hypotheses = [dict(zip(keys, values)) for values in itertools.product(*(HYPOTHESES[key] for key in keys))]
+
+    errors = {}
+    with multiprocessing.Pool(jobs) as pool:
+        for index, data, report, error in pool.imap(
+                partial(read_hypothesis, datatype, input_format, input_path, input_options), enumerate(hypotheses)):
+            if error is None:
+                # Report the settings that won, the pool stops the other processes
+                print("Settings: " + ", ".join(f"{key}={value:#04x}" if key == "write_constant" else f"{key}={value}"
+                                               for key, value in hypotheses[index].items()))
+                return data, report
+            errors[index] = error
+
+    # If no settings read the file, raise the error of the default ones
+    raise ConversionError(errors[0], 2)
+
+
+def convert(plugins_input: dict[str, dict[str, LazyPlugin]], plugins_output: dict[str, dict[str, LazyPlugin]], args: argparse.Namespace, input_path: pathlib.Path, datatype: str, input_format: str, output_path: Union[pathlib.Path, int, None], output_format: Optional[str]) -> None:
+    """
+    Converts one input file in the mode selected on the command line.
+
+    Args:
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        plugins_output (dict): A dictionary containing information about the output plugins.
+        args (argparse.Namespace): The parsed arguments.
+        input_path (pathlib.Path): The path to the input file.
+        datatype (str): The datatype.
+        input_format (str): The input format.
+        output_path (pathlib.Path or int): The path to the output file, or the descriptor of the standard output,
+            None when probing.
+        output_format (str): The output format, None when probing.
+    """
+    # Collect the options for the input and the output plugins
+    input_options, output_options = get_options(
+        args, plugins_input, plugins_output, datatype, input_format, output_format)
+
+    # Print the header of the input file without reading the data
+    if args.probe:
+        probe(plugins_input, input_path, datatype, input_format, input_options)
+        return
+
+    # The modes that read in a pool of processes use every core by default
+    jobs = args.jobs or os.cpu_count() or 1
+
+    # Write every program found in the input file to its own output file
+    if args.scan:
+        scan(plugins_input, plugins_output, input_path, datatype, input_format,
+             output_path, output_format, input_options, output_options, jobs, args.stats)
+        return
+
+    if args.hypotheses:
+        # Try the settings of the decoder until one of them reads the input file
+        data, report = search(plugins_input, input_path, datatype, input_format, input_options, jobs)
+    else:
+        # Read data from the input file using the specified plugin and format,
+        # the plugin fills the report with the statistics
+        report = {}
+        options = {**input_options, "report": report} if args.stats else input_options
+        data = read(plugins_input, input_path, datatype, input_format, options)
+
+    # Write the data to the output file using the specified plugin and format
+    write(plugins_output, output_path, datatype, output_format, data, output_options)
+
+    # Write the statistics of the decoding next to the output file
+    if args.stats:
+        write_stats(output_path, report)
+
+
+def batch(plugins_input: dict[str, dict[str, LazyPlugin]], plugins_output: dict[str, dict[str, LazyPlugin]], args: argparse.Namespace) -> None:
+    """
+    Converts several input files in one process, so the plugins are imported only once.
+
+    Every file is converted like a single input file, its datatype and format are
+    detected if they are not given. The output files are named by the template
+    and written to the output directory with the relative paths of the input
+    files, or next to the input files. An error in one file is printed and the
+    next files are still converted.
+
+    Args:
+        plugins_input (dict): A dictionary containing information about the input plugins.
+        plugins_output (dict): A dictionary containing information about the output plugins.
+        args (argparse.Namespace): The parsed arguments.
+    """
+    # If no input file is found, print an error message and exit
+    inputs = get_inputs(args.input)
+    if not inputs:
+        print(f"Input files not found: {' '.join(args.input)}")
+        sys.exit(1)
+
+    failed = 0
+    output_paths = set()
+    for input_path, relative_path in inputs:
+        print(f"{relative_path}:", end=" ", flush=True)
+        try:
+            datatype, input_format = get_input_info(args, plugins_input, input_path)
+
+            # Make the path to the output file from the template
+            output_path = None
+            if not args.probe:
+                if args.output_format not in plugins_output[datatype]:
+                    raise ConversionError(f"Output format not found: {args.output_format}", 1)
+                try:
+                    name = args.name.format(stem=input_path.stem, datatype=datatype,
+                                            input_format=input_format, format=args.output_format)
+                except (KeyError, IndexError, ValueError) as e:
+                    raise ConversionError(f"Invalid name of the output files: {args.name} ({e})", 1)
+                output_dir = input_path.parent if args.output_dir is None else pathlib.Path(
+                    args.output_dir).absolute() / relative_path.parent
+                output_path = output_dir / name
+
+                # Do not overwrite the input files and the files written before
+                if output_path == input_path or output_path in output_paths:
+                    raise ConversionError(f"Output file is already used: {output_path}", 1)
+                output_paths.add(output_path)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            convert(plugins_input, plugins_output, args, input_path, datatype, input_format,
+                    output_path, args.output_format)
+            if output_path is not None and not args.scan:
+                print(output_path.name)
+        except ConversionError as e:
+            # Print the error of the file and go on with the next file
+            print(e)
+            failed += 1
+        except Exception as e:
+            # An unexpected error of a plugin also stops only this file
+            print(f"{type(e).__name__}: {e}")
+            failed += 1
+
+    # If some files are not converted, print their number and exit
+    if failed:
+        print(f"Files not converted: {failed} of {len(inputs)}")
+        sys.exit(2)
 
 
 def main() -> None:
@@ -282,17 +1182,35 @@ def main() -> None:
     # Get the input and output plugins
     plugins_input, plugins_output = get_plugins()
 
-    # Get the datatype, input path, input format, output path, and output format from the command line arguments
-    datatype, input_path, input_format, output_path, output_format = get_args(
-        plugins_input, plugins_output)
+    # Get the arguments from the command line
+    args = get_args(plugins_input, plugins_output)
 
-    # Read data from the input file using the specified plugin and format
-    data = read(plugins_input, input_path, datatype, input_format)
+    # Convert several input files in one process
+    if args.batch:
+        batch(plugins_input, plugins_output, args)
+        return
 
-    # Write the data to the output file using the specified plugin and format
-    write(plugins_output, output_path, datatype, output_format, data)
+    try:
+        # Get the datatype and the input format of the input file
+        input_path = pathlib.Path(args.input[0]).absolute()
+        datatype, input_format = get_input_info(args, plugins_input, input_path)
+
+        # Get the output path and format from the command line arguments or the input path and format,
+        # there is no output file when probing
+        output_path, output_format = None, None
+        if not args.probe:
+            output_path, output_format = get_output_info(
+                args.output, args.output_format, input_path, plugins_output[datatype])
+
+        convert(plugins_input, plugins_output, args, input_path, datatype, input_format, output_path, output_format)
+    except ConversionError as e:
+        # Print the error and exit with its code
+        print(e)
+        sys.exit(e.code)
 
 
 if __name__ == "__main__":
+    # Support the worker processes in the frozen executable
+    multiprocessing.freeze_support()
     main()
     sys.exit(0)
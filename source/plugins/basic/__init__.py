@@ -1,6 +1,10 @@
 class Data:
-    lines = {}
-    name = b""
+    def __init__(self) -> None:
+        """
+        Initialize a program without lines and name.
+        """
+        self.lines = {}
+        self.name = b""
 
 
 to_basic = {0x80: "CLS",
@@ -198,3 +202,37 @@ to_koi7 = {"▘": 0x01,
            }
 
 from_koi7 = {v: k for k, v in to_koi7.items()}
+
+
+def read_header(f) -> dict:
+    """
+    Read the header of a program.
+
+    Args:
+        f: The file or the WAV reader positioned after the synchronization byte.
+
+    Returns:
+        dict: The name of the program.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    # Skip the signature and read the name, zero is no name
+    header = f.read(4)
+    if len(header) < 4:
+        raise ValueError("Unexpected end of file")
+    return {"name": "".join(from_koi7.get(i, "?") for i in header[3:] if i)}
+
+
+def detect_tape(data: bytes) -> int:
+    """
+    Scores how well the bytes after the synchronization byte match a program of this datatype.
+
+    Args:
+        data (bytes): The bytes after the synchronization byte.
+
+    Returns:
+        int: 100 if the bytes start with the signature of a BASIC program, 0 otherwise.
+    """
+    # The signature is three bytes D3, the name follows it
+    return 100 if data[:3] == b"\xD3\xD3\xD3" and data[3:4] != b"\xD3" else 0
@@ -1,7 +1,11 @@
 class Data:
-    lines = {}
-    name = b""
-    summ = 0
+    def __init__(self) -> None:
+        """
+        Initialize a program without lines and name, with a zero checksum.
+        """
+        self.lines = {}
+        self.name = b""
+        self.summ = 0
 
     def calc_summ(self):
         """
@@ -257,3 +261,42 @@ to_koi7 = {"▘": 0x01,
            }
 
 from_koi7 = {v: k for k, v in to_koi7.items()}
+
+
+def read_header(f) -> dict:
+    """
+    Read the header of a program.
+
+    Args:
+        f: The file or the WAV reader positioned after the synchronization byte.
+
+    Returns:
+        dict: The name of the program.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    # Skip to the start of the name
+    f.read(4)
+
+    # Read the name
+    name = b""
+    while (char := f.read(1)) != b"\x00":
+        if not char:
+            raise ValueError("Unexpected end of file")
+        name += char
+    return {"name": "".join(from_koi7.get(i, "?") for i in name)}
+
+
+def detect_tape(data: bytes) -> int:
+    """
+    Scores how well the bytes after the synchronization byte match a program of this datatype.
+
+    Args:
+        data (bytes): The bytes after the synchronization byte.
+
+    Returns:
+        int: 100 if the bytes start with the signature of a BASIC program, 0 otherwise.
+    """
+    # The signature is four bytes D3, the name follows it
+    return 100 if data[:4] == b"\xD3\xD3\xD3\xD3" else 0
@@ -1,4 +1,4 @@
-from .. import Data
+from .. import Data, read_header, detect_tape
 from pathlib import Path
 
 
@@ -59,6 +59,38 @@ def input(input_path: Path) -> Data:
     return obj
 
 
+def probe(input_path: Path) -> dict:
+    """
+    Reads only the header of an RKR file.
+
+    Args:
+        input_path (Path): Path to the input file.
+
+    Returns:
+        dict: The fields of the header.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    with open(input_path, "rb") as f:
+        return read_header(f)
+
+
+def detect(input_path: Path) -> int:
+    """
+    Scores how well the contents of a RKR file match this datatype.
+
+    Args:
+        input_path (Path): Path to the input file.
+
+    Returns:
+        int: The score from 0 to 100, 0 if the file does not match.
+    """
+    # The longest program fits into the first 0x10100 bytes
+    with open(input_path, "rb") as f:
+        return detect_tape(f.read(0x10100))
+
+
 def output(output_path: Path, obj: Data) -> None:
     """
     Write the contents of a Data object to a RKR file.
@@ -1,14 +1,15 @@
-from . import wav_open
-from .. import Data
+import wav_open
+from .. import Data, read_header, detect_tape
 from pathlib import Path
 
 
-def input(input_path: Path) -> Data:
+def input(input_path: Path, **options) -> Data:
     """
     Reads a BasMicron WAV file and returns a Data object.
 
     Args:
         input_path (Path): Path to the input file.
+        **options: Keyword arguments passed to the WAV reader.
 
     Returns:
         Data: Data object containing the contents of the input file.
@@ -20,7 +21,7 @@ def input(input_path: Path) -> Data:
     obj = Data()
 
     # Open the WAV file in read mode
-    with wav_open.open(input_path, "r") as f:
+    with wav_open.open(input_path, "r", **options) as f:
 
         # Skip the first 4 bytes
         f.read(4)
@@ -68,19 +69,70 @@ def input(input_path: Path) -> Data:
     return obj
 
 
-def output(output_path: Path, obj: Data):
+def probe(input_path: Path, **options) -> dict:
+    """
+    Reads only the header of a WAV file.
+
+    The WAV file is decoded only up to the end of the header, unless the
+    numpy engine is selected.
+
+    Args:
+        input_path (Path): Path to the input file.
+        **options: Keyword arguments passed to the WAV reader.
+
+    Returns:
+        dict: The fields of the header.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    with wav_open.open(input_path, "r", **options) as f:
+        return read_header(f)
+
+
+def scan(input_path: Path, **options) -> list[tuple[int, int]]:
+    """
+    Finds the programs recorded in a WAV file.
+
+    Args:
+        input_path (Path): Path to the input file.
+        **options: Keyword arguments passed to the WAV reader.
+
+    Returns:
+        list[tuple[int, int]]: The numbers of the frames where a program may start,
+            to be passed to input() as the offset option, and where its leader ends.
+    """
+    return wav_open.scan(input_path, **options)
+
+
+def detect(input_path: Path) -> int:
+    """
+    Scores how well the first program of a WAV file matches this datatype.
+
+    Args:
+        input_path (Path): Path to the input file.
+
+    Returns:
+        int: The score from 0 to 100, 0 if the file does not match.
+    """
+    # The signature
+    return detect_tape(wav_open.peek(input_path, 4))
+
+
+def output(output_path: Path, obj: Data, **options):
     """
     Write the contents of a Data object to a WAV file.
 
     Args:
         output_path (Path): The path to the file to write.
         obj (Data): The Data object containing the contents to write.
+        **options: Keyword arguments passed to the WAV writer.
 
     Raises:
-        None
+        ValueError: If the options of the WAV writer are invalid.
     """
     # Open the WAV file for writing
-    with wav_open.open(output_path, "w") as f:
+    with wav_open.open(output_path, "w", **options) as f:
         # Write the padding and the file signature
         f.write(b"\x00" * 64)
         f.write(b"\xe6\xd3\xd3\xd3\xd3")
@@ -149,3 +149,51 @@ to_koi7 = {"▘": 0x01,
            }
 
 from_koi7 = {v: k for k, v in to_koi7.items()}
+
+
+def read_header(f) -> dict:
+    """
+    Read the header of a program.
+
+    Args:
+        f: The file or the WAV reader positioned after the synchronization byte.
+
+    Returns:
+        dict: The name and the length of the text.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    # Read the name, skipping the synchronization bytes before it
+    name = b""
+    while (byte := f.read(1)) != b"\x00":
+        if not byte:
+            raise ValueError("Unexpected end of file")
+        if byte != b"\xE6":
+            name += byte
+
+    # Skip to the start of the text
+    while (byte := f.read(1)) != b"\xE6":
+        if not byte:
+            raise ValueError("Unexpected end of file")
+
+    # Read the length of the text
+    size = f.read(2)
+    if len(size) < 2:
+        raise ValueError("Unexpected end of file")
+    return {"name": "".join(from_koi7.get(i, "?") for i in name),
+            "length": 0xffff - int.from_bytes(size, byteorder="little")}
+
+
+def detect_tape(data: bytes) -> int:
+    """
+    Scores how well the bytes after the synchronization byte match a program of this datatype.
+
+    Args:
+        data (bytes): The bytes after the synchronization byte.
+
+    Returns:
+        int: 100 if the bytes start with the synchronization bytes of a text, 0 otherwise.
+    """
+    # The name of the text follows five synchronization bytes
+    return 100 if data[:4] == b"\xE6\xE6\xE6\xE6" and data[4:5] != b"\xE6" else 0
@@ -1,4 +1,4 @@
-from .. import Data
+from .. import Data, read_header, detect_tape
 from pathlib import Path
 
 
@@ -45,6 +45,48 @@ def input(input_path: Path) -> Data:
     return obj
 
 
+def probe(input_path: Path) -> dict:
+    """
+    Reads only the header of a GAM file.
+
+    Args:
+        input_path (Path): Path to the input file.
+
+    Returns:
+        dict: The fields of the header.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    with open(input_path, "rb") as f:
+        # Find the start of the data
+        while (byte := f.read(1)) != b"\xE6":
+            if not byte:
+                raise ValueError("Synchronization byte not found")
+        return read_header(f)
+
+
+def detect(input_path: Path) -> int:
+    """
+    Scores how well the contents of a GAM file match this datatype.
+
+    Args:
+        input_path (Path): Path to the input file.
+
+    Returns:
+        int: The score from 0 to 100, 0 if the file does not match.
+    """
+    # The longest program fits into the first 0x10100 bytes
+    with open(input_path, "rb") as f:
+        content = f.read(0x10100)
+
+    # The program starts after the synchronization byte, only a leader of zeros may be before it
+    start = content.find(b"\xE6")
+    if start < 0 or content[:start].strip(b"\x00"):
+        return 0
+    return detect_tape(content[start + 1:])
+
+
 def output(output_path: Path, obj: Data) -> None:
     """
     Writes the contents of a Data object to a Gam file.
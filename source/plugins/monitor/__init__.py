@@ -42,3 +42,67 @@ def checksum_calc(data: bytes) -> int:
 
     # Return the checksum modulo 65536 (to ensure the checksum fits in 16 bits)
     return summ & 0xffff
+
+
+def read_header(f) -> dict:
+    """
+    Read the header of a program.
+
+    Args:
+        f: The file or the WAV reader positioned after the synchronization byte.
+
+    Returns:
+        dict: The start and end addresses of the program.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    # Read the start and end addresses
+    header = f.read(4)
+    if len(header) < 4:
+        raise ValueError("Unexpected end of file")
+    return {"start": int.from_bytes(header[:2]), "end": int.from_bytes(header[2:])}
+
+
+def detect_tape(data: bytes) -> int:
+    """
+    Scores how well the bytes after the synchronization byte match a program of this datatype.
+
+    Args:
+        data (bytes): The bytes after the synchronization byte.
+
+    Returns:
+        int: 100 if the checksum matches the data between the addresses, 0 otherwise.
+    """
+    # The start address must not be after the end address
+    if len(data) < 4:
+        return 0
+    start = int.from_bytes(data[:2])
+    end = int.from_bytes(data[2:4])
+    if end < start:
+        return 0
+
+    # The checksum follows the synchronization byte after the data
+    size = end - start + 1
+    marker = data.find(b"\xE6", 4 + size)
+    if len(data) < 4 + size or marker < 0 or len(data) < marker + 3:
+        return 0
+    return 100 if int.from_bytes(data[marker + 1:marker + 3]) == checksum_calc(data[4:4 + size]) else 0
+
+
+def tape_size(header: bytes) -> int:
+    """
+    Returns the number of bytes after the synchronization byte that detect_tape checks.
+
+    Args:
+        header (bytes): The first four bytes after the synchronization byte.
+
+    Returns:
+        int: The addresses, the data, a leader of up to 256 bytes, the synchronization
+            byte and the checksum, or only the addresses if they do not describe a block.
+    """
+    start = int.from_bytes(header[:2])
+    end = int.from_bytes(header[2:4])
+    if len(header) < 4 or end < start:
+        return 4
+    return 4 + end - start + 1 + 0x103
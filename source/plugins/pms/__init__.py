@@ -1,6 +1,10 @@
 class Data:
-    lines = []
-    summ = 0
+    def __init__(self) -> None:
+        """
+        Initialize a text without lines, with a zero checksum.
+        """
+        self.lines = []
+        self.summ = 0
 
     def calc_summ(self) -> None:
         """
@@ -177,3 +181,72 @@ to_koi7 = {"▘": 0x01,
            }
 
 from_koi7 = {v: k for k, v in to_koi7.items()}
+
+
+def read_header(f) -> dict:
+    """
+    Read the header of a program.
+
+    Args:
+        f: The file or the WAV reader positioned after the synchronization byte.
+
+    Returns:
+        dict: The checksum and the length of the data.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    # Read the checksum and the length
+    header = f.read(4)
+    if len(header) < 4:
+        raise ValueError("Unexpected end of file")
+    return {"checksum": int.from_bytes(header[:2], "little"), "length": int.from_bytes(header[2:], "little")}
+
+
+def detect_tape(data: bytes) -> int:
+    """
+    Scores how well the bytes after the synchronization byte match a program of this datatype.
+
+    Args:
+        data (bytes): The bytes after the synchronization byte.
+
+    Returns:
+        int: 100 if the checksum matches the lines of the given length, 0 otherwise.
+    """
+    if len(data) < 4:
+        return 0
+
+    # Read the lines the same way as the input plugins
+    summ = int.from_bytes(data[:2], "little")
+    length = int.from_bytes(data[2:4], "little")
+    obj = Data()
+    pos = 4
+    while length > 0:
+        if pos >= len(data):
+            return 0
+        line_len = data[pos]
+        length -= line_len
+        if length <= 0 or line_len <= 0:
+            break
+        if pos + line_len > len(data):
+            return 0
+        obj.lines.append(data[pos + 1:pos + line_len])
+        pos += line_len
+
+    # Compare the checksum
+    obj.calc_summ()
+    return 100 if summ == obj.summ else 0
+
+
+def tape_size(header: bytes) -> int:
+    """
+    Returns the number of bytes after the synchronization byte that detect_tape checks.
+
+    Args:
+        header (bytes): The first four bytes after the synchronization byte.
+
+    Returns:
+        int: The checksum, the length and the lines up to the length with the length
+            byte of the next line.
+    """
+    return 4 + int.from_bytes(header[2:4], "little") + 1
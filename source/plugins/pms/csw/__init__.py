@@ -0,0 +1,87 @@
+import wav_open
+from .. import Data, wav, detect_tape, tape_size
+from pathlib import Path
+
+
+def input(input_path: Path, **options) -> Data:
+    """
+    Reads a CSW file and returns a Data object.
+
+    The pulses of the file are decoded by the WAV reader, the file has the
+    same layout as a WAV file of this datatype.
+
+    Args:
+        input_path (Path): Path to the input file.
+        **options: Keyword arguments passed to the WAV reader.
+
+    Returns:
+        Data: Data object containing the contents of the input file.
+
+    Raises:
+        ValueError: If the file can not be decoded.
+    """
+    return wav.input(input_path, **options)
+
+
+def probe(input_path: Path, **options) -> dict:
+    """
+    Reads only the header of a CSW file.
+
+    Args:
+        input_path (Path): Path to the input file.
+        **options: Keyword arguments passed to the WAV reader.
+
+    Returns:
+        dict: The fields of the header.
+
+    Raises:
+        ValueError: If the file ends before the header.
+    """
+    return wav.probe(input_path, **options)
+
+
+def scan(input_path: Path, **options) -> list[tuple[int, int]]:
+    """
+    Finds the programs recorded in a CSW file.
+
+    Args:
+        input_path (Path): Path to the input file.
+        **options: Keyword arguments passed to the WAV reader.
+
+    Returns:
+        list[tuple[int, int]]: The numbers of the frames where a program may start,
+            to be passed to input() as the offset option, and where its leader ends.
+    """
+    return wav.scan(input_path, **options)
+
+
+def detect(input_path: Path) -> int:
+    """
+    Scores how well the first program of a CSW file matches this datatype.
+
+    Args:
+        input_path (Path): Path to the input file.
+
+    Returns:
+        int: The score from 0 to 100, 0 if the file does not match.
+    """
+    # Decode the checksum and the length first and the lines only as far as the length
+    header = wav_open.peek(input_path, 4, container="csw")
+    return detect_tape(wav_open.peek(input_path, tape_size(header), container="csw"))
+
+
+def output(output_path: Path, obj: Data, **options) -> None:
+    """
+    Writes a Data object to a CSW file.
+
+    The file is written with the same layout as a WAV file of this datatype.
+
+    Args:
+        output_path (Path): Path to the output file.
+        obj (Data): Data object to write to the file.
+        **options: Keyword arguments passed to the CSW writer.
+
+    Raises:
+        ValueError: If the options of the CSW writer are invalid.
+    """
+    wav.output(output_path, obj, container="csw", **options)
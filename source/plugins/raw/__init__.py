@@ -6,3 +6,17 @@ class Data:
         data (bytes): The raw data.
     """
     data = bytes()
+
+
+def detect_tape(data: bytes) -> int:
+    """
+    Scores how well the bytes after the synchronization byte match a program of this datatype.
+
+    Args:
+        data (bytes): The bytes after the synchronization byte.
+
+    Returns:
+        int: 1 if there are any bytes, 0 otherwise. Raw data is chosen only when
+            no other datatype matches.
+    """
+    return 1 if data else 0
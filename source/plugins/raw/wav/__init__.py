@@ -1,20 +1,21 @@
-from ..import Data
+from ..import Data, detect_tape
 from pathlib import Path
-from . import wav_open
+import wav_open
 
 
-def input(input_path: Path) -> Data:
+def input(input_path: Path, **options) -> Data:
     """
     Reads a wav file and returns its contents as Data object.
 
     Args:
         input_path (Path): Path to the input wav file.
+        **options: Keyword arguments passed to the WAV reader.
 
     Returns:
         Data: Data object containing the wav file contents.
     """
     # Open the input wav file in read mode
-    with wav_open.open(input_path, "r") as f:
+    with wav_open.open(input_path, "r", **options) as f:
         # Create a new Data object
         obj = Data()
         # Read the wav file contents and store them in the Data object
@@ -23,16 +24,46 @@ def input(input_path: Path) -> Data:
     return obj
 
 
-def output(output_path: Path, obj: Data) -> None:
+def scan(input_path: Path, **options) -> list[tuple[int, int]]:
+    """
+    Finds the programs recorded in a WAV file.
+
+    Args:
+        input_path (Path): Path to the input file.
+        **options: Keyword arguments passed to the WAV reader.
+
+    Returns:
+        list[tuple[int, int]]: The numbers of the frames where a program may start,
+            to be passed to input() as the offset option, and where its leader ends.
+    """
+    return wav_open.scan(input_path, **options)
+
+
+def detect(input_path: Path) -> int:
+    """
+    Scores how well the first program of a WAV file matches this datatype.
+
+    Args:
+        input_path (Path): Path to the input file.
+
+    Returns:
+        int: The score from 0 to 100, 0 if the file does not match.
+    """
+    # Any byte
+    return detect_tape(wav_open.peek(input_path, 1))
+
+
+def output(output_path: Path, obj: Data, **options) -> None:
     """
     Writes the contents of a Data object to a wav file.
 
     Args:
         output_path (Path): Path to the output wav file.
         obj (Data): Data object containing the wav file contents.
+        **options: Keyword arguments passed to the WAV writer.
     """
     # Open the output wav file in write mode
-    with wav_open.open(output_path, "w") as f:
+    with wav_open.open(output_path, "w", **options) as f:
         # Write the pilot tone (64 bytes of 0x00) and the stop byte (0xE6)
         f.write(b"\x00" * 64)
         f.write(b"\xE6")
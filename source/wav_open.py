@@ -0,0 +1,2500 @@
+import builtins
+import mmap
+import multiprocessing
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from itertools import chain, islice, repeat
+from operator import add, length_hint, sub
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    # The numpy engine imports NumPy only when it is used
+    import numpy
+
+# The signature at the start of a CSW (compressed square wave) file
+CSW_SIGNATURE = b"Compressed Square Wave\x1a"
+
+
+def open(f, mode, container: str = "wav", **options):
+    """
+    Open a file in specified mode.
+
+    Args:
+        f (str, WavFile or CswFile): The file path, or a loaded file in read mode.
+        mode (str): The mode to open the file in.
+        container (str, optional): The kind of the file to write: "wav" or "csw".
+            A file to read is recognized by its signature. Defaults to "wav".
+        **options: Keyword arguments passed to the writer or the WavReader. A list
+            of sample rates as the frequency writes one file for every rate.
+
+    Returns:
+        WavWriter, CswWriter, FanoutWriter or WavReader: The opened file object.
+
+    Raises:
+        ValueError: If the container is unknown.
+    """
+    if mode == "w":
+        # Open file in write mode.
+        writers = {"wav": WavWriter, "csw": CswWriter}
+        if container not in writers:
+            raise ValueError(f"Unknown container: {container}")
+        if isinstance(options.get("frequency"), (list, tuple)):
+            return FanoutWriter(f, writers[container], **options)
+        return writers[container](f, **options)
+    else:
+        # Open file in read mode.
+        return WavReader(f, **options)
+
+
+def load(filename: str) -> Union["WavFile", "CswFile"]:
+    """
+    Loads a WAV or a CSW file, depending on its signature.
+
+    Args:
+        filename (str): The path to the file.
+
+    Returns:
+        WavFile or CswFile: The loaded file.
+
+    Raises:
+        ValueError: If the file is not a supported WAV or CSW file.
+    """
+    with builtins.open(str(filename), "rb") as f:
+        signature = f.read(len(CSW_SIGNATURE))
+    return CswFile(filename) if signature == CSW_SIGNATURE else WavFile(filename)
+
+
+def scan(f, leader: int = 256, **options) -> list[tuple[int, int]]:
+    """
+    Find the programs recorded in a WAV or CSW file.
+
+    Args:
+        f (str, WavFile or CswFile): The file path, or a loaded file.
+        leader (int, optional): The minimum number of single half-bits in the leader
+            of a program. Defaults to 256.
+        **options: Keyword arguments passed to the WavReader.
+
+    Returns:
+        list[tuple[int, int]]: The numbers of the frames where a decoding of a program
+            may start and where its leader ends.
+    """
+    with WavReader(f, sync=False, **options) as reader:
+        return reader.scan(leader)
+
+
+# The first bytes decoded by peek and whether they are all the bytes, by the file, the container and the time of the file
+_peeks = {}
+
+
+def peek(filename, size: int, container: str = "wav") -> bytes:
+    """
+    Decodes the first bytes of a recording after the synchronization byte.
+
+    The bytes are used to detect the datatype of the recording, so only the
+    bytes a datatype checks are decoded, and they are kept for the other
+    datatypes that check the same file.
+
+    Args:
+        filename (str): The path to the file.
+        size (int): The number of bytes.
+        container (str, optional): The container the file must have, "wav" or
+            "csw". Defaults to "wav".
+
+    Returns:
+        bytes: The decoded bytes, fewer of them at the end of the recording, or no
+            bytes if the file is not a recording in the container or has no program.
+    """
+    key = (str(filename), container, Path(filename).stat().st_mtime_ns)
+    data, complete = _peeks.get(key, (b"", False))
+    if len(data) < size and not complete:
+        if len(_peeks) >= 16:
+            _peeks.clear()
+
+        # Decode the bytes again from the start, up to the new size
+        data = bytearray()
+        try:
+            with load(filename) as source:
+                if isinstance(source, CswFile) == (container == "csw"):
+                    # Read the bytes one by one to keep the bytes before the end of the recording
+                    with WavReader(source) as reader:
+                        while len(data) < size:
+                            data += reader.read(1)
+        except ValueError:
+            pass
+        data = bytes(data)
+        complete = len(data) < size
+        _peeks[key] = (data, complete)
+    return data[:size]
+
+
+def _import_numpy():
+    """
+    Imports NumPy for the numpy engine.
+
+    Returns:
+        module: The numpy module.
+
+    Raises:
+        ValueError: If NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ValueError("The numpy engine requires the numpy package")
+    return numpy
+
+
+class _Encoder:
+    def __init__(self, tact_ticks: int, frame_ticks: int, levels: tuple[int, int]) -> None:
+        """
+        Initialize an _Encoder object.
+
+        The encoder synthesizes the frames of the bytes that start at a given
+        phase and keeps no phase of its own, so the segments of a long recording
+        can be synthesized apart, even in other processes, and joined.
+
+        Args:
+            tact_ticks (int): The time of one tact in ticks.
+            frame_ticks (int): The time of one frame in ticks.
+            levels (tuple[int, int]): The low and the high level of the signal.
+
+        Returns:
+            None
+        """
+        self.__tact_ticks = tact_ticks
+        self.__frame_ticks = frame_ticks
+        self.__levels = levels
+
+        # The lengths of the bits of a byte depend only on the phase of the byte.
+        # Bit j of the byte ends one frame later when the phase is at least the
+        # j-th breakpoint, so the phases between two breakpoints share one waveform.
+        double_frame = 2 * frame_ticks
+        self.__breakpoints = sorted({double_frame - 2 * j * tact_ticks % double_frame
+                                     for j in range(1, 9)} - {double_frame})
+
+        # The waveforms of the bytes by the class of the phase and the value of the byte
+        self.__waveforms = {}
+
+    def advance(self, phase: int, count: int) -> int:
+        """
+        Calculates the phase after the given number of bytes.
+
+        Args:
+            phase (int): The phase of the first byte.
+            count (int): The number of bytes.
+
+        Returns:
+            int: The phase of the byte after them.
+        """
+        return (phase + 16 * count * self.__tact_ticks) % (2 * self.__frame_ticks)
+
+    def count_frames(self, phase: int, count: int) -> int:
+        """
+        Calculates the number of frames of the given number of bytes.
+
+        Args:
+            phase (int): The phase of the first byte.
+            count (int): The number of bytes.
+
+        Returns:
+            int: The number of frames of the bytes.
+        """
+        return (phase + 16 * count * self.__tact_ticks) // (2 * self.__frame_ticks)
+
+    def encode(self, data: bytes, phase: int, engine: str = "python") -> Iterator[bytes]:
+        """
+        Synthesizes the frames of the given bytes in blocks.
+
+        The data is encoded in blocks to keep the memory bounded, and for the
+        numpy engine also to keep the number of ticks within 64 bits.
+
+        Args:
+            data (bytes): The data to encode.
+            phase (int): The phase of the first byte.
+            engine (str, optional): The encoding engine, "python" or "numpy".
+                Defaults to "python".
+
+        Yields:
+            bytes: The frames of the next block.
+        """
+        encode = self.__encode_numpy if engine == "numpy" else self.__encode
+        for start in range(0, len(data), 0x1000):
+            block = data[start:start + 0x1000]
+            yield encode(block, phase)
+
+            # Move the phase to the next block
+            phase = self.advance(phase, len(block))
+
+    def __encode(self, data: bytes, phase: int) -> bytes:
+        """
+        Synthesizes the frames of the given bytes from the waveforms of the bytes.
+
+        Args:
+            data (bytes): The data to encode.
+            phase (int): The phase of the first byte.
+
+        Returns:
+            bytes: The frames of the data.
+        """
+        # Keep the state of the encoder in local variables for speed
+        breakpoints = self.__breakpoints
+        waveforms = self.__waveforms
+        step = 16 * self.__tact_ticks
+        double_frame = 2 * self.__frame_ticks
+
+        # Collect the waveforms of the bytes
+        output = []
+        for byte in data:
+            # Find the waveform of the byte at its phase
+            key = (bisect_right(breakpoints, phase), byte)
+            waveform = waveforms.get(key)
+            if waveform is None:
+                waveform = waveforms[key] = self.__waveform(phase, byte)
+            output.append(waveform)
+
+            # Move the phase to the next byte
+            phase = (phase + step) % double_frame
+
+        # Join the waveforms at once
+        return b"".join(output)
+
+    def __waveform(self, phase: int, byte: int) -> bytes:
+        """
+        Synthesizes the waveform of one byte.
+
+        Every bit is split into two halves, the first half has the level of the
+        bit and the second half has the opposite level. An odd frame goes to the
+        second half.
+
+        Args:
+            phase (int): The phase of the first bit of the byte.
+            byte (int): The value of the byte.
+
+        Returns:
+            bytes: The frames of the byte.
+        """
+        # Initialize the frames to write
+        frames = [bytes((level,)) for level in self.__levels]
+        double_frame = 2 * self.__frame_ticks
+
+        output = []
+        for j in range(8):
+            # Get the bit value from the byte
+            bit = (byte >> (7 - j)) & 1
+
+            # Calculate the number of frames of the current bit from the frames where it starts and ends
+            x = (phase + 2 * (j + 1) * self.__tact_ticks) // double_frame
+            x -= (phase + 2 * j * self.__tact_ticks) // double_frame
+
+            # Append the appropriate frames
+            output.append(frames[bit] * (x // 2))
+            output.append(frames[bit ^ 1] * ((x // 2) + (x % 2)))
+        return b"".join(output)
+
+    def __encode_numpy(self, data: bytes, phase: int) -> bytes:
+        """
+        Synthesizes the frames of the given bytes with the numpy engine.
+
+        The bytes are expanded into bits and the frames where the bits end are
+        calculated for all the bits at once, by the same formula as __waveform.
+
+        Args:
+            data (bytes): The data to encode.
+            phase (int): The phase of the first byte.
+
+        Returns:
+            bytes: The frames of the data.
+        """
+        numpy = _import_numpy()
+        double_frame = 2 * self.__frame_ticks
+        levels = numpy.array(self.__levels, numpy.uint8)
+
+        # Expand the data into bits, the highest bit of a byte goes first
+        bits = numpy.unpackbits(numpy.frombuffer(data, numpy.uint8))
+
+        # Calculate the frames where the bits end and the number of frames of every bit
+        ticks = numpy.arange(len(bits) + 1, dtype=numpy.int64) * (2 * self.__tact_ticks) + phase
+        lengths = numpy.diff(ticks // double_frame)
+
+        # Split every bit into two halves, an odd frame goes to the second half
+        halves = numpy.empty(2 * len(bits), numpy.int64)
+        halves[0::2] = lengths // 2
+        halves[1::2] = lengths - lengths // 2
+
+        # The first half has the level of the bit and the second half the opposite level
+        values = numpy.empty(2 * len(bits), numpy.uint8)
+        values[0::2] = levels[bits]
+        values[1::2] = levels[bits ^ 1]
+
+        return numpy.repeat(values, halves).tobytes()
+
+
+def _encode_segment(segment: tuple) -> None:
+    """
+    Synthesizes the frames of one segment of a recording in a worker process.
+
+    The frames are written right to their place in the file, so only the
+    bytes of the segment are sent to the worker and nothing is sent back.
+
+    Args:
+        segment (tuple): The time of one tact and of one frame in ticks, the
+            levels of the signal, the engine, the bytes of the segment, the
+            phase of its first byte, the path to the file and the position of
+            the frames in it.
+    """
+    tact_ticks, frame_ticks, levels, engine, data, phase, path, position = segment
+    with builtins.open(path, "r+b") as f:
+        f.seek(position)
+        for frames in _Encoder(tact_ticks, frame_ticks, levels).encode(data, phase, engine):
+            f.write(frames)
+
+
+class WavWriter:
+    # The number of bytes in one segment of the data synthesized by a worker process
+    SEGMENT_SIZE = 0x10000
+
+    # The frames of runs of one repeated byte, like leaders and gaps, shared by all the writers
+    __runs = {}
+
+    # The breakpoints of the phase for the runs of every length
+    __run_breakpoints = {}
+
+    def __init__(self, filename: Union[str, int], frequency: int = 44100, write_constant: int = 0x1d,
+                 engine: str = "python", buffer_size: int = 0x1000000, amplitude: int = 0x60,
+                 jobs: int = 1) -> None:
+        """
+        Initialize a WavWriter object.
+
+        The frames are collected in a buffer and the file is written at once
+        when the writer is closed, so the header is written only one time.
+        An output that can not seek, like a pipe, is streamed instead: the header
+        with an unknown length is written first, and the frames are written
+        as soon as they are synthesized.
+
+        The phase of every byte follows from the number of the bytes before it,
+        and so does the position of its frames. With several jobs a long write
+        is split into segments that worker processes synthesize and write right
+        to their places in a temporary file, and the frames are the same as
+        those of one process.
+
+        Args:
+            filename (str or int): The path to the output file, or the descriptor
+                of an open file like the standard output.
+            frequency (int): The sample rate of the output audio. Default is 44100.
+            write_constant (int): The write constant for the output audio. Default is 0x1d.
+            engine (str, optional): The encoding engine: "python" joins cached
+                waveforms of the bytes, "numpy" computes the waveform of all the
+                bits with array operations. Both produce the same frames.
+                Defaults to "python".
+            buffer_size (int, optional): The number of frames kept in memory, the
+                frames are moved to a temporary file if there are more of them.
+                Defaults to 0x1000000.
+            amplitude (int, optional): The distance of the two levels of the signal
+                from the middle level 0x80, from 1 to 0x7F. Defaults to 0x60.
+            jobs (int, optional): The number of processes that synthesize the
+                writes longer than two segments. Defaults to 1.
+
+        Raises:
+            ValueError: If the engine is unknown or not available, or the sample rate,
+                the write constant, the amplitude or the number of jobs is out of range.
+
+        Returns:
+            None
+        """
+        # Nothing has to be closed until the output file is created
+        self.__is_closed = True
+
+        # Check the engine before the output file is created
+        if engine == "numpy":
+            _import_numpy()
+        elif engine != "python":
+            raise ValueError(f"Unknown engine: {engine}")
+        self.__engine = engine
+
+        # Check the parameters of the signal
+        if frequency < 1:
+            raise ValueError(f"Invalid sample rate: {frequency}")
+        if write_constant < 0:
+            raise ValueError(f"Invalid write constant: {write_constant}")
+        if not 1 <= amplitude <= 0x7F:
+            raise ValueError(f"Invalid amplitude: {amplitude}")
+        if jobs < 1:
+            raise ValueError(f"Invalid number of jobs: {jobs}")
+
+        # The worker processes and the file they write to are created by the first long write
+        self.__jobs = jobs
+        self.__pool = None
+        self.__shared = None
+        self.__shared_path = None
+
+        # The low and the high level of the signal
+        self.__levels = (0x80 - amplitude, 0x80 + amplitude)
+
+        # Open the output file in binary write mode.
+        self.__f = builtins.open(filename if isinstance(filename, int) else str(filename), "wb")
+
+        # Initialize the flag indicating whether the file is closed.
+        self.__is_closed = False
+
+        # Store the given frequency for future use.
+        self.__frequency = frequency
+
+        if self.__f.seekable():
+            # Collect the frames in memory, or in a temporary file if there are too many of them
+            self.__stream = False
+            self.__buffer = tempfile.SpooledTemporaryFile(max_size=buffer_size)
+        else:
+            # Stream the frames after a header with the largest length
+            self.__stream = True
+            self.__buffer = self.__f
+            self.__f.write(self.__header(0xFFFFFFFF))
+
+        # Measure the time in ticks of 1/(16000000 * frequency) seconds, so that both
+        # the time of one tact (one bit) and the time of one frame are whole numbers.
+        # Bit m ends at frame floor((2 * m * tact + frame - 1) / (2 * frame)), which is
+        # the time of the bit rounded to the nearest frame.
+        self.__tact_ticks = (1376 + write_constant*450) * frequency
+        self.__frame_ticks = 16000000
+
+        # The phase is 2 * m * tact + frame - 1 modulo 2 * frame for the next bit m.
+        # A bit that ends exactly between two frames is rounded down, the same way
+        # as the floating-point calculation of the earlier versions at 44100 Hz.
+        self.__phase = self.__frame_ticks - 1
+
+        # The encoder of the bytes at the given phase
+        self.__encoder = _Encoder(self.__tact_ticks, self.__frame_ticks, self.__levels)
+
+    def write(self, data: bytes) -> None:
+        """
+        Write the given bytes to the output file.
+
+        Args:
+            data (bytes): The data to write.
+
+        Returns:
+            None
+        """
+        # A run of one repeated byte, like a leader, is taken from the cache of runs
+        if 1 < len(data) <= 0x1000 and data.count(data[0]) == len(data):
+            self.__write_run(data)
+        elif self.__jobs > 1 and len(data) > 2 * self.SEGMENT_SIZE:
+            self.__write_parallel(data)
+        else:
+            for frames in self.__encoder.encode(data, self.__phase, self.__engine):
+                self.__buffer.write(frames)
+            self.__phase = self.__encoder.advance(self.__phase, len(data))
+
+        # Send the frames to the stream right away
+        if self.__stream:
+            self.__f.flush()
+
+    def __write_parallel(self, data: bytes) -> None:
+        """
+        Writes the given bytes to the output file with several worker processes.
+
+        The data is split into segments, and the phase and the position of the
+        frames of every segment are calculated from the number of the bytes
+        before it. The workers write the frames to a temporary file that takes
+        the place of the buffer, or that is copied to a stream after the write.
+
+        Args:
+            data (bytes): The data to write.
+
+        Returns:
+            None
+        """
+        # Start the worker processes
+        if self.__pool is None:
+            self.__pool = multiprocessing.Pool(self.__jobs)
+
+        # Create the file the workers can open by its path
+        if self.__shared is None:
+            fd, self.__shared_path = tempfile.mkstemp()
+            self.__shared = builtins.open(fd, "w+b")
+
+            # Move the frames written so far, the file is the buffer from now on
+            if not self.__stream:
+                self.__buffer.seek(0)
+                shutil.copyfileobj(self.__buffer, self.__shared)
+                self.__buffer.close()
+                self.__buffer = self.__shared
+
+        # Allocate the frames after the buffer, or at the start of the file of a stream
+        start = 0 if self.__stream else self.__shared.tell()
+        end = start + self.__encoder.count_frames(self.__phase, len(data))
+        self.__shared.flush()
+        self.__shared.truncate(end)
+
+        # Make the segments with their phases and the positions of their frames
+        segments = []
+        for first in range(0, len(data), self.SEGMENT_SIZE):
+            segments.append((self.__tact_ticks, self.__frame_ticks, self.__levels, self.__engine,
+                             data[first:first + self.SEGMENT_SIZE], self.__encoder.advance(self.__phase, first),
+                             self.__shared_path, start + self.__encoder.count_frames(self.__phase, first)))
+        self.__pool.map(_encode_segment, segments)
+        self.__phase = self.__encoder.advance(self.__phase, len(data))
+
+        # Send the frames to the stream, or continue after them
+        if self.__stream:
+            self.__shared.seek(0)
+            shutil.copyfileobj(self.__shared, self.__f)
+        else:
+            self.__shared.seek(end)
+
+    def __write_run(self, data: bytes) -> None:
+        """
+        Writes a run of one repeated byte to the output file.
+
+        The frames of a run depend only on the breakpoints of its bits that the
+        phase has passed, like the frames of one byte, so a run that starts at a
+        phase between the same breakpoints is copied from the cache.
+
+        Args:
+            data (bytes): The run to write.
+
+        Returns:
+            None
+        """
+        double_frame = 2 * self.__frame_ticks
+
+        # Find the breakpoints of all the bits of the run
+        key = (self.__tact_ticks, len(data))
+        breakpoints = self.__run_breakpoints.get(key)
+        if breakpoints is None:
+            if len(self.__run_breakpoints) >= 256:
+                self.__run_breakpoints.clear()
+            breakpoints = self.__run_breakpoints[key] = sorted(
+                {double_frame - 2 * m * self.__tact_ticks % double_frame
+                 for m in range(1, 8 * len(data) + 1)} - {double_frame})
+
+        # Take the frames of the run from the cache or synthesize them
+        key += (self.__levels, data[0], bisect_right(breakpoints, self.__phase))
+        frames = self.__runs.get(key)
+        if frames is None:
+            if len(self.__runs) >= 256:
+                self.__runs.clear()
+            frames = self.__runs[key] = b"".join(self.__encoder.encode(data, self.__phase))
+
+        # Move the phase to the byte after the run
+        self.__phase = self.__encoder.advance(self.__phase, len(data))
+
+        self.__buffer.write(frames)
+
+    def close(self) -> None:
+        """
+        Closes the output file and releases any system resources associated with it.
+
+        This method is called when the WavWriter object is destroyed or when the
+        close() method is called explicitly.
+
+        Returns:
+            None
+        """
+        # Check if the object is already closed
+        if self.__is_closed:
+            # If it is, do nothing and return
+            return
+
+        # Set the flag to indicate that the object is closed
+        self.__is_closed = True
+
+        try:
+            # The header of a stream is already written
+            if not self.__stream:
+                # Write the header with the number of the frames
+                self.__f.write(self.__header(self.__buffer.tell()))
+
+                # Copy the frames after the header
+                self.__buffer.seek(0)
+                shutil.copyfileobj(self.__buffer, self.__f)
+        finally:
+            # Stop the worker processes
+            if self.__pool is not None:
+                self.__pool.terminate()
+
+            # Close the buffer and the output file
+            self.__buffer.close()
+            self.__f.close()
+
+            # Remove the file written by the worker processes
+            if self.__shared is not None:
+                self.__shared.close()
+                os.remove(self.__shared_path)
+
+    def __header(self, size: int) -> bytes:
+        """
+        Creates the header of an 8-bit mono PCM WAV file.
+
+        Args:
+            size (int): The number of the frames, the lengths are limited to 0xFFFFFFFF.
+
+        Returns:
+            bytes: The header.
+        """
+        return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", min(36 + size, 0xFFFFFFFF), b"WAVE",
+                           b"fmt ", 16, 1, 1, self.__frequency, self.__frequency, 1, 8,
+                           b"data", min(size, 0xFFFFFFFF))
+
+    def __del__(self) -> None:
+        """
+        Closes the output file and releases any system resources associated with it.
+
+        This method is called when the WavWriter object is destroyed. It ensures that the
+        output file is properly closed to avoid any resource leaks.
+
+        Returns:
+            None
+        """
+        # Close the output file and release any system resources associated with it
+        self.close()
+
+    def __enter__(self) -> "WavWriter":
+        """
+        Allows the use of the WavWriter object in a context manager.
+
+        This method is called when the WavWriter object is used in a with statement.
+        It returns the WavWriter object itself, allowing the user to access its methods
+        and attributes within the with block.
+
+        Returns:
+            WavWriter: The WavWriter object itself.
+        """
+
+        # Return the WavWriter object itself to allow its methods and attributes
+        # to be accessed within the with block
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Closes the WavReader object in a context manager.
+
+        This method is called when the WavReader object is used in a with statement.
+        It ensures that the object is properly closed to avoid any resource leaks.
+
+        Args:
+            *args: Variable length argument list (not used in this method).
+
+        Returns:
+            None
+        """
+        # Close the WavReader object and release any system resources associated with it
+        self.close()
+
+
+class CswWriter:
+    def __init__(self, filename: Union[str, int], frequency: int = 44100, write_constant: int = 0x1d,
+                 engine: str = "python", version: int = 2, jobs: int = 1, **options) -> None:
+        """
+        Initialize a CswWriter object.
+
+        A CSW file keeps the lengths of the pulses of the signal instead of its
+        frames. The pulses are calculated from the times of the bits the same way
+        as WavWriter calculates the frames, so the file decodes to the same
+        half-bits as the WAV file with the same parameters.
+
+        Args:
+            filename (str or int): The path to the output file, or the descriptor
+                of an open file like the standard output.
+            frequency (int): The sample rate the lengths of the pulses are measured in.
+                Default is 44100.
+            write_constant (int): The write constant for the output signal. Default is 0x1d.
+            engine (str, optional): The encoding engine: "python" or "numpy".
+                Both produce the same pulses. Defaults to "python".
+            version (int, optional): The version of the CSW format: 1 for the
+                version 1.01 with RLE compression, 2 for the version 2.0 with Z-RLE
+                compression. Defaults to 2.
+            jobs (int, optional): Not used, a pulse takes one step per half-bit, so
+                the pulses are always calculated in one process. Defaults to 1.
+            **options: The options of WavWriter that have no meaning for a CSW file.
+
+        Raises:
+            ValueError: If the engine or the version is unknown, the sample rate or
+                the write constant is out of range, or an option is not supported.
+
+        Returns:
+            None
+        """
+        # Nothing has to be closed until the output file is created
+        self.__is_closed = True
+
+        # The levels of the signal and the size of the buffer do not exist in a CSW file
+        if options:
+            raise ValueError(f"Options are not supported by CSW files: {', '.join(options)}")
+
+        # Check the engine before the output file is created
+        if engine == "numpy":
+            self.__numpy = _import_numpy()
+        elif engine != "python":
+            raise ValueError(f"Unknown engine: {engine}")
+        self.__engine = engine
+
+        # Check the parameters of the signal
+        if version not in (1, 2):
+            raise ValueError(f"Unsupported CSW version: {version}")
+        if not 1 <= frequency <= (0xFFFF if version == 1 else 0xFFFFFFFF):
+            raise ValueError(f"Invalid sample rate: {frequency}")
+        if write_constant < 0:
+            raise ValueError(f"Invalid write constant: {write_constant}")
+        self.__version = version
+        self.__frequency = frequency
+
+        # Open the output file in binary write mode.
+        self.__f = builtins.open(filename if isinstance(filename, int) else str(filename), "wb")
+        self.__is_closed = False
+
+        # Measure the time in the same ticks as WavWriter
+        self.__tact_ticks = (1376 + write_constant*450) * frequency
+        self.__frame_ticks = 16000000
+        self.__phase = self.__frame_ticks - 1
+
+        # The lengths of the finished pulses, the pulse that may continue
+        # in the next write, and its level
+        self.__pulses = array("I")
+        self.__pulse = 0
+        self.__level = None
+
+    def write(self, data: bytes) -> None:
+        """
+        Write the given bytes to the output file.
+
+        Args:
+            data (bytes): The data to write.
+
+        Returns:
+            None
+        """
+        if self.__engine == "numpy":
+            self.__write_numpy(data)
+            return
+
+        # Keep the state of the encoder in local variables for speed
+        pulses = self.__pulses
+        pulse = self.__pulse
+        level = self.__level
+        phase = self.__phase
+        step = 2 * self.__tact_ticks
+        double_frame = 2 * self.__frame_ticks
+
+        for byte in data:
+            for shift in range(7, -1, -1):
+                # Get the bit value from the byte
+                bit = (byte >> shift) & 1
+
+                # Calculate the number of frames of the current bit from the phase where it ends
+                phase += step
+                x = phase // double_frame
+                phase -= x * double_frame
+
+                # The first half has the level of the bit and the second half the
+                # opposite level, an odd frame goes to the second half
+                for length, half_level in ((x // 2, bit), (x - x // 2, bit ^ 1)):
+                    if not length:
+                        continue
+
+                    # A half with the level of the current pulse continues it
+                    if half_level == level:
+                        pulse += length
+                    else:
+                        if level is not None:
+                            pulses.append(pulse)
+                        pulse = length
+                        level = half_level
+
+        self.__pulse = pulse
+        self.__level = level
+        self.__phase = phase
+
+    def __write_numpy(self, data: bytes) -> None:
+        """
+        Writes the given bytes to the output file with the numpy engine.
+
+        Args:
+            data (bytes): The data to write.
+
+        Returns:
+            None
+        """
+        numpy = self.__numpy
+        double_frame = 2 * self.__frame_ticks
+
+        for start in range(0, len(data), 0x10000):
+            # Calculate the number of frames of every bit the same way as WavWriter
+            block = data[start:start + 0x10000]
+            bits = numpy.unpackbits(numpy.frombuffer(block, numpy.uint8))
+            ticks = numpy.arange(len(bits) + 1, dtype=numpy.int64) * (2 * self.__tact_ticks) + self.__phase
+            lengths = numpy.diff(ticks // double_frame)
+            self.__phase = (self.__phase + 16 * len(block) * self.__tact_ticks) % double_frame
+
+            # Split every bit into two halves with the opposite levels
+            halves = numpy.empty(2 * len(bits), numpy.int64)
+            halves[0::2] = lengths // 2
+            halves[1::2] = lengths - lengths // 2
+            levels = numpy.empty(2 * len(bits), numpy.uint8)
+            levels[0::2] = bits
+            levels[1::2] = bits ^ 1
+
+            # Drop the empty halves and join the neighbouring halves with the same level into pulses
+            keep = halves > 0
+            halves = halves[keep]
+            levels = levels[keep]
+            if not len(halves):
+                continue
+            starts = numpy.flatnonzero(numpy.diff(levels, prepend=levels[0] ^ 1))
+            pulses = numpy.add.reduceat(halves, starts).tolist()
+
+            # The first pulse may continue the pulse of the previous write
+            if int(levels[0]) == self.__level:
+                pulses[0] += self.__pulse
+            elif self.__level is not None:
+                self.__pulses.append(self.__pulse)
+
+            # The last pulse may continue in the next write
+            self.__pulses.extend(pulses[:-1])
+            self.__pulse = pulses[-1]
+            self.__level = int(levels[-1])
+
+    def close(self) -> None:
+        """
+        Writes the pulses to the output file and closes it.
+
+        Returns:
+            None
+        """
+        # Check if the object is already closed
+        if self.__is_closed:
+            return
+
+        # Set the flag to indicate that the object is closed
+        self.__is_closed = True
+
+        try:
+            # Finish the last pulse
+            pulses = self.__pulses
+            if self.__level is not None:
+                pulses.append(self.__pulse)
+
+            # The level of the first pulse is the level of the last one when their number is odd
+            polarity = 0 if self.__level is None else self.__level ^ (len(pulses) & 1) ^ 1
+
+            # Every pulse takes one byte, a longer pulse takes a zero byte and four bytes of the length
+            if not pulses or max(pulses) < 0x100:
+                data = array("B", pulses).tobytes()
+            else:
+                data = b"".join(bytes((pulse,)) if pulse < 0x100 else b"\x00" + pulse.to_bytes(4, "little")
+                                for pulse in pulses)
+
+            if self.__version == 1:
+                # The header of the version 1.01 with RLE compression
+                header = struct.pack("<BBHBB3x", 1, 1, self.__frequency, 1, polarity)
+            else:
+                # The header of the version 2.0 with Z-RLE compression
+                header = struct.pack("<BBIIBBB16s", 2, 0, self.__frequency, len(pulses), 2, polarity, 0,
+                                     b"rk86conv")
+                data = zlib.compress(data, 9)
+
+            self.__f.write(CSW_SIGNATURE + header + data)
+        finally:
+            self.__f.close()
+
+    def __del__(self) -> None:
+        """
+        Closes the output file when the object is destroyed.
+
+        Returns:
+            None
+        """
+        self.close()
+
+    def __enter__(self) -> "CswWriter":
+        """
+        Allows the use of the CswWriter object in a context manager.
+
+        Returns:
+            CswWriter: The CswWriter object itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Closes the CswWriter object in a context manager.
+
+        Args:
+            *args: Variable length argument list (not used in this method).
+
+        Returns:
+            None
+        """
+        self.close()
+
+
+class FanoutWriter:
+    def __init__(self, filename: Union[str, int], writer: type, frequency: Sequence[int], **options) -> None:
+        """
+        Writes the same data at several sample rates at once.
+
+        Every rate gets its own file named after the given one with the rate
+        added to the name, like program_22050.wav. The data is passed to the
+        writers of all the rates in one call, so the source is read and laid
+        out only once.
+
+        Args:
+            filename (str or int): The path the names of the files are made from.
+                One rate is written to this path itself, which can also be the
+                descriptor of an open file.
+            writer (type): The class of the writer of one file, WavWriter or CswWriter.
+            frequency (Sequence[int]): The sample rates.
+            **options: Keyword arguments passed to every writer.
+
+        Raises:
+            ValueError: If there are no rates, several rates have to be written to
+                a descriptor, or a writer can not be created.
+
+        Returns:
+            None
+        """
+        self.__writers = []
+        if not frequency:
+            raise ValueError("No sample rates given")
+
+        # Make the names of the files
+        if len(frequency) == 1:
+            filenames = [filename]
+        elif isinstance(filename, int):
+            raise ValueError("Several sample rates can not be written to one file")
+        else:
+            path = Path(filename)
+            filenames = [path.with_name(f"{path.stem}_{rate}{path.suffix}") for rate in frequency]
+
+        try:
+            for name, rate in zip(filenames, frequency):
+                self.__writers.append(writer(name, frequency=rate, **options))
+        except ValueError:
+            # Remove the files that are already created
+            self.close()
+            for name in filenames[:len(self.__writers)]:
+                Path(name).unlink(missing_ok=True)
+            raise
+
+    def write(self, data: bytes) -> None:
+        """
+        Write the given bytes to the files of all the rates.
+
+        Args:
+            data (bytes): The data to write.
+
+        Returns:
+            None
+        """
+        for writer in self.__writers:
+            writer.write(data)
+
+    def close(self) -> None:
+        """
+        Closes the files of all the rates.
+
+        Returns:
+            None
+        """
+        for writer in self.__writers:
+            writer.close()
+
+    def __enter__(self) -> "FanoutWriter":
+        """
+        Allows the use of the FanoutWriter object in a context manager.
+
+        Returns:
+            FanoutWriter: The FanoutWriter object itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Closes the FanoutWriter object in a context manager.
+
+        Args:
+            *args: Variable length argument list (not used in this method).
+
+        Returns:
+            None
+        """
+        self.close()
+
+
+class WavFile:
+    def __init__(self, filename: str) -> None:
+        """
+        Maps a WAV file into memory.
+
+        The header of the file is parsed directly and the frames are accessed
+        through a memoryview of the mapping, so nothing is copied. One WavFile
+        can be shared by several WavReader objects.
+
+        Args:
+            filename (str): The path to the WAV file.
+
+        Raises:
+            ValueError: If the file is not a PCM WAV file.
+
+        Returns:
+            None
+        """
+        # Nothing to unmap until the mapping exists
+        self.__is_closed = True
+
+        # Map the whole file, the mapping stays valid after the file is closed
+        with builtins.open(str(filename), "rb") as f:
+            try:
+                self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Not a WAV file: {filename}")
+        self.__is_closed = False
+
+        # Check the RIFF header
+        if self.__map[0:4] != b"RIFF" or self.__map[8:12] != b"WAVE":
+            self.close()
+            raise ValueError(f"Not a WAV file: {filename}")
+
+        # Find the format and the data chunks
+        fmt = None
+        data = None
+        pos = 12
+        while pos + 8 <= len(self.__map):
+            chunk_id = self.__map[pos:pos + 4]
+            size = int.from_bytes(self.__map[pos + 4:pos + 8], "little")
+            pos += 8
+            # Take only the part of the chunk present in a truncated file
+            available = min(size, len(self.__map) - pos)
+            if chunk_id == b"fmt " and available >= 16:
+                fmt = struct.unpack_from("<HHIIHH", self.__map, pos)
+
+                # The extensible format keeps the real format in the subformat
+                if fmt[0] == 0xFFFE and available >= 26:
+                    fmt = struct.unpack_from("<H", self.__map, pos + 24) + fmt[1:]
+            elif chunk_id == b"data":
+                data = (pos, min(size, len(self.__map) - pos))
+                break
+
+            # Chunks are aligned to two bytes
+            pos += size + (size & 1)
+
+        # Reject the formats and the layouts that can't be decoded
+        if fmt is None or data is None or fmt[0] != 1 or 0 in (fmt[1], fmt[2], fmt[5]):
+            self.close()
+            raise ValueError(f"Unsupported WAV file: {filename}")
+
+        # Get the layout of the frames
+        self.__channels = fmt[1]
+        self.__framerate = fmt[2]
+        self.__sampwidth = (fmt[5] + 7) // 8
+        self.__nframes = data[1] // (self.__channels * self.__sampwidth)
+
+        # Keep only the whole frames
+        self.__start = data[0]
+        self.__frames = memoryview(self.__map)[
+            self.__start:self.__start + self.__nframes * self.__channels * self.__sampwidth]
+
+    def getnchannels(self) -> int:
+        """
+        Returns:
+            int: The number of channels.
+        """
+        return self.__channels
+
+    def getsampwidth(self) -> int:
+        """
+        Returns:
+            int: The sample width in bytes.
+        """
+        return self.__sampwidth
+
+    def getframerate(self) -> int:
+        """
+        Returns:
+            int: The sample rate.
+        """
+        return self.__framerate
+
+    def getnframes(self) -> int:
+        """
+        Returns:
+            int: The number of frames.
+        """
+        return self.__nframes
+
+    def getframes(self) -> memoryview:
+        """
+        Returns:
+            memoryview: The frames of the file without copying them.
+        """
+        return self.__frames
+
+    def drop(self, start: int, stop: int) -> None:
+        """
+        Tells the system that a range of the frames is not needed anymore.
+
+        The pages are dropped from the memory of the process, so the resident
+        memory does not grow with the length of the file. They are read again
+        from the page cache if they are accessed later.
+
+        Args:
+            start (int): The offset of the first byte of the range in the frames.
+            stop (int): The offset after the last byte of the range in the frames.
+        """
+        if self.__is_closed or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+
+        # Only whole pages can be dropped
+        start = -(-(self.__start + start) // mmap.PAGESIZE) * mmap.PAGESIZE
+        stop = (self.__start + stop) // mmap.PAGESIZE * mmap.PAGESIZE
+        if start < stop:
+            self.__map.madvise(mmap.MADV_DONTNEED, start, stop - start)
+
+    def close(self) -> None:
+        """
+        Unmaps the WAV file.
+
+        The mapping stays alive while any view of the frames exists.
+        """
+        # Check if the file is already closed
+        if self.__is_closed:
+            return
+
+        # Set the flag indicating that the file is closed
+        self.__is_closed = True
+
+        # Release the view of the frames and unmap the file
+        if hasattr(self, "_WavFile__frames"):
+            self.__frames.release()
+        try:
+            self.__map.close()
+        except BufferError:
+            pass
+
+    def __del__(self) -> None:
+        """
+        Unmaps the WAV file when the object is destroyed.
+        """
+        self.close()
+
+    def __enter__(self) -> "WavFile":
+        """
+        Allows the use of the WavFile object in a context manager.
+
+        Returns:
+            WavFile: The WavFile object itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Unmaps the WAV file at the end of the with block.
+
+        Args:
+            *args: Variable length argument list (not used in this method).
+        """
+        self.close()
+
+
+class CswFile:
+    def __init__(self, filename: str) -> None:
+        """
+        Reads the pulses of a CSW file.
+
+        The versions 1.01 and 2.0 of the format are supported, with RLE and
+        Z-RLE compression. The pulses are measured in frames of the sample rate
+        of the file, so the WavReader decodes them like the runs of the frames
+        of a WAV file.
+
+        Args:
+            filename (str): The path to the CSW file.
+
+        Raises:
+            ValueError: If the file is not a supported CSW file.
+
+        Returns:
+            None
+        """
+        with builtins.open(str(filename), "rb") as f:
+            content = f.read()
+
+        # Check the signature
+        if not content.startswith(CSW_SIGNATURE):
+            raise ValueError(f"Not a CSW file: {filename}")
+        pos = len(CSW_SIGNATURE)
+
+        # Read the header of the version
+        try:
+            if content[pos] == 1:
+                self.__framerate, compression, flags = struct.unpack_from("<HBB", content, pos + 2)
+                data = content[pos + 9:]
+            elif content[pos] == 2:
+                self.__framerate, _, compression, flags, extension = struct.unpack_from("<IIBBB", content, pos + 2)
+                data = content[pos + 29 + extension:]
+            else:
+                raise ValueError(f"Unsupported CSW version: {content[pos]}.{content[pos + 1]:02}")
+        except (IndexError, struct.error):
+            raise ValueError(f"Not a CSW file: {filename}")
+
+        # Decompress the Z-RLE data of the version 2.0
+        if compression == 2 and content[pos] == 2:
+            try:
+                data = zlib.decompress(data)
+            except zlib.error:
+                raise ValueError(f"Corrupted CSW file: {filename}")
+        elif compression != 1:
+            raise ValueError(f"Unsupported CSW compression: {compression}")
+
+        # Every pulse takes one byte, a longer pulse takes a zero byte and four bytes of the length
+        self.__pulses = array("I")
+        pos = 0
+        while (zero := data.find(0, pos)) >= 0:
+            self.__pulses.extend(data[pos:zero])
+            self.__pulses.append(int.from_bytes(data[zero + 1:zero + 5], "little"))
+            pos = zero + 5
+        self.__pulses.extend(data[pos:])
+
+        # The level of the first pulse
+        self.__polarity = flags & 1
+
+    def getnchannels(self) -> int:
+        """
+        Returns:
+            int: The number of channels, a CSW file has one.
+        """
+        return 1
+
+    def getsampwidth(self) -> int:
+        """
+        Returns:
+            int: The sample width in bytes, one for the two levels of the pulses.
+        """
+        return 1
+
+    def getframerate(self) -> int:
+        """
+        Returns:
+            int: The sample rate the lengths of the pulses are measured in.
+        """
+        return self.__framerate
+
+    def getpulses(self) -> array:
+        """
+        Returns:
+            array: The lengths of the pulses in frames.
+        """
+        return self.__pulses
+
+    def getpolarity(self) -> int:
+        """
+        Returns:
+            int: The level of the first pulse, 1 for high and 0 for low.
+        """
+        return self.__polarity
+
+    def close(self) -> None:
+        """
+        Releases the pulses, the file itself is closed after reading.
+        """
+        self.__pulses = array("I")
+
+    def __enter__(self) -> "CswFile":
+        """
+        Allows the use of the CswFile object in a context manager.
+
+        Returns:
+            CswFile: The CswFile object itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Releases the pulses at the end of the with block.
+
+        Args:
+            *args: Variable length argument list (not used in this method).
+        """
+        self.close()
+
+
+class WavReader:
+    # The number of frames or half-bits the numpy engine processes at once
+    NUMPY_BLOCK_SIZE = 0x40000
+
+    # The half-bits after the double half-bit of the synchronization byte \xe6
+    SYNC_HALVES = (1, 1, 1, 1, 2, 1, 1, 2, 1, 1, 2)
+
+    def __init__(self, filename: Union[str, WavFile, CswFile], write_constant: int = 0x1d, block_size: int = 0x10000,
+                 engine: str = "python", channel: Union[int, str] = "auto", offset: int = 0,
+                 sync: bool = True, report: Optional[dict] = None, clock: str = "mean",
+                 gain: float = 0.0625, threshold: str = "adaptive", invert: bool = False) -> None:
+        """
+        Initializes a WavReader object.
+
+        Args:
+            filename (str, WavFile or CswFile): The name of the WAV or CSW file to
+                read, or a loaded file. A loaded file is shared and is not closed by
+                the reader. The pulses of a CSW file are decoded as the runs of the
+                frames of a WAV file, so the channel and the threshold do not matter.
+            write_constant (int, optional): The write constant for calculating the half-bit time.
+                Defaults to 0x1d.
+            block_size (int, optional): The number of frames read from the file at once.
+                Defaults to 0x10000.
+            engine (str, optional): The decoding engine: "python" decodes the file
+                frame by frame while reading, "numpy" decodes the whole file at once
+                with NumPy. Defaults to "python".
+            channel (int or str, optional): The channel to decode: its index, "left",
+                "right", "sum" to mix all channels down, or "auto" to pick the channel
+                with the best signal-to-noise ratio. Defaults to "auto".
+            offset (int, optional): The number of the frame to start decoding from.
+                Defaults to 0.
+            sync (bool, optional): Whether to synchronize on the first byte. Without
+                the synchronization only scan() can be used. Defaults to True.
+            report (dict, optional): A dictionary that receives the statistics of
+                the decoding when the reader is closed, see __statistics(). The
+                half-bits are recorded for the statistics only if it is given.
+                Defaults to None.
+            clock (str, optional): The recovery of the half-bit time: "mean" divides
+                the time by the number of half-bits read since the start, "pll"
+                follows the length of every half-bit to track the changes of the
+                speed of the tape. Defaults to "mean".
+            gain (float, optional): The part of the difference between the length
+                of a half-bit and the half-bit time that the "pll" clock follows.
+                Defaults to 0.0625.
+            threshold (str, optional): The level that separates the half-bits:
+                "adaptive" is the middle between the maximum and the minimum values
+                read so far, "fixed" is the middle of the range of the samples.
+                Defaults to "adaptive".
+            invert (bool, optional): Whether to decode the inverted signal, for
+                recordings with the opposite polarity. Defaults to False.
+
+        Raises:
+            ValueError: If the first byte read from the file is not \xe6,
+                the engine is not available, the channel does not exist or the
+                clock or the threshold is unknown.
+
+        Returns:
+            None
+        """
+        # Map the WAV file into memory or read the CSW file, unless it is already loaded
+        self.__started = time.perf_counter()
+        self.__is_closed = True
+        self.__own_file = not isinstance(filename, (WavFile, CswFile))
+        self.__f = load(filename) if self.__own_file else filename
+        self.__pulses = isinstance(self.__f, CswFile)
+        self.__is_closed = False
+        self.__data = None
+        self.__runs = None
+        self.__offset = offset
+        self.__position = offset
+        self.__report = report
+        self.__engine = engine
+        self.__speed = []
+        self.__lengths = None
+        self.__times = None
+        self.__sync_run = None
+
+        # Get the sample rate of the WAV file
+        self.__frequency = self.__f.getframerate()
+
+        # Calculate the half-bit time based on the write constant
+        self.__halfbit_time = (1376 + write_constant*450)/32000000
+        self.__start_time = self.__halfbit_time
+        self.__frames = 0
+        self.__readed_halfbits = 1
+        self.__frame_time = 1 / self.__frequency
+        self.__clock = clock
+        self.__gain = gain
+        if clock not in ("mean", "pll"):
+            raise ValueError(f"Unknown clock: {clock}")
+        self.__threshold = threshold
+        self.__invert = invert
+        if threshold not in ("adaptive", "fixed"):
+            raise ValueError(f"Unknown threshold: {threshold}")
+
+        # Get the layout of the frames in the WAV file
+        self.__channels = self.__f.getnchannels()
+        self.__sampwidth = self.__f.getsampwidth()
+        self.__block_size = block_size
+        if not 1 <= self.__sampwidth <= 4:
+            raise ValueError(f"Unsupported sample width: {self.__sampwidth * 8} bits")
+
+        # Select the channel to decode
+        self.__channel = self.__select_channel(channel)
+
+        # Determine if the WAV file uses signed samples
+        self.__signed = self.__sampwidth > 1
+
+        # Initialize the neutral value based on the signedness of the samples
+        self.__neutral = 127 if not self.__signed else 0
+        if self.__channel == "sum":
+            self.__neutral *= self.__channels
+
+        # The inverted value of a sample is its distance from the top of the range
+        self.__top = 0 if self.__signed else 255 * (self.__channels if self.__channel == "sum" else 1)
+
+        if engine == "numpy":
+            # Decode the whole file at once, unless it is only scanned
+            self.__data = self.__decode_numpy() if sync else b""
+            self.__bytes = iter(self.__data)
+        elif engine == "python":
+            # Record the lengths of the half-bits and the half-bit times for the statistics
+            if report is not None:
+                self.__lengths = array("q")
+                self.__times = array("d")
+
+            # Create the generators of the lengths of the half-bits and of the bytes
+            self.__runs = self.__read_pulses() if self.__pulses else self.__read_runs()
+            self.__bytes = self.__read_bytes()
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+
+        # Check if the first byte read from the file is \xe6
+        if sync and next(self.__bytes, None) != 0xE6:
+            raise ValueError("Synchronization byte not found")
+
+    def __select_channel(self, channel: Union[int, str]) -> Union[int, str]:
+        """
+        Converts the channel option to the index of the channel or "sum".
+
+        Args:
+            channel (int or str): The index of the channel, "left", "right", "sum" or "auto".
+
+        Returns:
+            int or str: The index of the channel or "sum".
+
+        Raises:
+            ValueError: If the channel does not exist.
+        """
+        name = channel
+        channel = {"left": 0, "right": 1}.get(channel, channel)
+        if isinstance(channel, str) and channel.isdigit():
+            channel = int(channel)
+
+        if self.__channels == 1 and channel in ("sum", "auto"):
+            # There is nothing to choose from
+            return 0
+        elif channel == "auto":
+            # Estimate the signal-to-noise ratio of every channel on the first second
+            frames = self.__f.getframes()
+            frame_size = self.__channels * self.__sampwidth
+            head = frames[:self.__frequency * frame_size]
+            return max(range(self.__channels), key=lambda i: self.__estimate_snr(self.__convert_channel(head, i)))
+        elif channel == "sum" or isinstance(channel, int) and 0 <= channel < self.__channels:
+            return channel
+        raise ValueError(f"Channel not found: {name}")
+
+    @staticmethod
+    def __estimate_snr(samples: Sequence[int]) -> float:
+        """
+        Estimates the signal-to-noise ratio of a tape signal.
+
+        The signal is the distance between the quartiles of the samples, which
+        lie on the two levels of the square wave. The noise is the median
+        difference between neighbouring samples, which mostly lie on the same level.
+
+        Args:
+            samples (Sequence[int]): The samples of one channel.
+
+        Returns:
+            float: The estimated signal-to-noise ratio.
+        """
+        if len(samples) < 2:
+            return 0
+        levels = sorted(samples)
+        signal = levels[len(levels) * 3 // 4] - levels[len(levels) // 4]
+        noise = sorted(map(abs, map(sub, samples[1:], samples[:-1])))[len(samples) // 2]
+        return signal / (noise + 1)
+
+    def __convert_channel(self, raw: memoryview, channel: int) -> Sequence[int]:
+        """
+        Converts whole frames to the values of the samples of one channel.
+
+        Args:
+            raw (memoryview): The bytes of whole frames.
+            channel (int): The index of the channel.
+
+        Returns:
+            Sequence[int]: The values of the samples.
+        """
+        channels = self.__channels
+        sampwidth = self.__sampwidth
+
+        if sampwidth == 1:
+            # Unsigned 8-bit samples are the values themselves
+            return raw[channel::channels]
+
+        if sampwidth == 3:
+            # Place the 24-bit samples into the upper bytes of 32-bit integers,
+            # which scales them by 256 and keeps the sign
+            step = 3 * channels
+            offset = 3 * channel
+            wide = bytearray(len(raw) // step * 4)
+            wide[1::4] = raw[offset::step].tobytes()
+            wide[2::4] = raw[offset + 1::step].tobytes()
+            wide[3::4] = raw[offset + 2::step].tobytes()
+            if sys.byteorder == "little":
+                return memoryview(wide).cast("i")
+            block = array("i", wide)
+            block.byteswap()
+            return block
+
+        typecode = "h" if sampwidth == 2 else "i"
+        if sys.byteorder == "little":
+            # View the samples as integers without copying them
+            return raw.cast(typecode)[channel::channels]
+
+        # Convert the whole block of signed little-endian samples at once
+        block = array(typecode, raw)
+        block.byteswap()
+        return block[channel::channels]
+
+    def __convert(self, raw: memoryview) -> Sequence[int]:
+        """
+        Converts whole frames to the values of the samples of the selected channel.
+
+        Args:
+            raw (memoryview): The bytes of whole frames.
+
+        Returns:
+            Sequence[int]: The values of the samples.
+        """
+        if self.__channel != "sum":
+            return self.__convert_channel(raw, self.__channel)
+
+        # Mix all channels down
+        channels = [self.__convert_channel(raw, i) for i in range(self.__channels)]
+        if len(channels) == 2:
+            return array("q", map(add, *channels))
+        return array("q", map(sum, zip(*channels)))
+
+    def __invert_samples(self, samples: Sequence[int]) -> Sequence[int]:
+        """
+        Inverts the values of the samples.
+
+        Args:
+            samples (Sequence[int]): The values of the samples.
+
+        Returns:
+            Sequence[int]: The inverted values of the samples.
+        """
+        if self.__top == 255:
+            # Invert the unsigned 8-bit samples with a translation table
+            return bytes(samples).translate(bytes(range(255, -1, -1)))
+        return array("q", map(sub, repeat(self.__top), samples))
+
+    def __read_blocks(self) -> Iterator[Sequence[int]]:
+        """
+        Reads the WAV file block by block.
+
+        Yields:
+            Sequence[int]: The values of the samples of the selected channel.
+        """
+        # Size of one block in bytes
+        block_bytes = self.__block_size * self.__channels * self.__sampwidth
+        raw = self.__f.getframes()
+        offset = min(self.__offset * self.__channels * self.__sampwidth, len(raw))
+
+        for start in range(offset, len(raw), block_bytes):
+            stop = min(start + block_bytes, len(raw))
+            samples = self.__convert(raw[start:stop])
+            if self.__invert:
+                samples = self.__invert_samples(samples)
+            yield samples
+
+            # The block is decoded, its memory is not needed anymore
+            self.__f.drop(start, stop)
+
+    def __read_runs(self) -> Iterator[int]:
+        """
+        Splits the frames of the WAV file into half-bits.
+
+        Yields:
+            int: The number of frames in the next half-bit.
+        """
+        # Keep the state of the decoder in local variables for speed
+        neutral = self.__neutral
+        max_value = neutral
+        min_value = neutral
+
+        # A fixed threshold never moves, because no frame is outside of these limits
+        if self.__threshold == "fixed":
+            max_value = 1 << 64
+            min_value = -1 << 64
+        hb = 1
+        count_fr = 1  # Counts the number of frames in the current half-bit
+        skip = True
+        position = self.__offset  # The number of the first frame of the block
+
+        for block in self.__read_blocks():
+            frames = iter(block)
+
+            # Skip any leading frames that are greater than the neutral value
+            if skip:
+                for index, frame in enumerate(frames):
+                    if frame <= neutral:
+                        skip = False
+
+                        # The first half-bit starts at this frame
+                        self.__position = position + index
+                        break
+                position += len(block)
+
+            for frame in frames:
+                # Update the neutral value based on the maximum and minimum values.
+                # Updating them never moves the frame to the other side of the
+                # neutral value, so the level of the frame is known beforehand.
+                # The frames are integers, so the neutral value is rounded down.
+                if frame > neutral:
+                    if frame > max_value:
+                        max_value = frame
+                        neutral = (max_value + min_value) >> 1
+
+                    # Check if the current frame value is different from the previous half-bit value
+                    if hb:
+                        hb = 0
+                        yield count_fr
+                        count_fr = 1
+                    else:
+                        count_fr += 1
+                else:
+                    if frame < min_value:
+                        min_value = frame
+                        neutral = (max_value + min_value) >> 1
+
+                    # Check if the current frame value is different from the previous half-bit value
+                    if hb:
+                        count_fr += 1
+                    else:
+                        hb = 1
+                        yield count_fr
+                        count_fr = 1
+
+    def __read_pulses(self) -> Iterator[int]:
+        """
+        Takes the half-bits from the pulses of the CSW file.
+
+        The pulses before the offset and the high pulse at the start are skipped,
+        the same way as the frames of a WAV file.
+
+        Yields:
+            int: The number of frames in the next half-bit.
+        """
+        high = self.__f.getpolarity() ^ self.__invert
+        skip = True
+        position = 0  # The number of the frame where the pulse ends
+
+        for pulse in self.__f.getpulses():
+            # Only the part of the pulse after the offset is read
+            start = max(position, self.__offset)
+            position += pulse
+            if position > start:
+                if not skip:
+                    yield position - start
+                elif not high:
+                    skip = False
+
+                    # The first half-bit starts at the start of the first low pulse
+                    self.__position = start
+                    yield position - start
+            high ^= 1
+
+    def __read_halfbits(self) -> Iterator[int]:
+        """
+        Reads the half-bits from the WAV file after the synchronization.
+
+        A half-bit longer than 1.5 of the half-bit time is a double
+        half-bit. The first double half-bit synchronizes the decoder, and the
+        half-bits are read starting from its second half. The speed of the
+        tape is recorded every 256 half-bits.
+
+        Yields:
+            int: The value of the next half-bit (1 or 0).
+        """
+        # Keep the state of the decoder in local variables for speed
+        frame_time = self.__frame_time
+        start_time = self.__start_time
+        halfbit_time = self.__halfbit_time
+        readed_halfbits = self.__readed_halfbits
+        frames = self.__frames
+        pll = self.__clock == "pll"
+        gain = self.__gain
+        speed = self.__speed
+        lengths = self.__lengths
+        times = self.__times
+        mark = 256
+        hb = 1
+        synced = False
+
+        for count_fr in self.__runs:
+            # Update the number of read half-bits and the time
+            readed_halfbits += 1
+            frames += count_fr - 1
+            hb ^= 1
+            self.__position += count_fr
+
+            # Record the half-bit for the statistics
+            if lengths is not None:
+                lengths.append(count_fr)
+                times.append(halfbit_time)
+
+            # check if we counted two half-bits
+            double = count_fr * frame_time > 1.5 * halfbit_time
+            if double:
+                readed_halfbits += 1
+
+            # Update the half-bit time
+            if pll:
+                halfbit_time += gain * (count_fr * frame_time / (1 + double) - halfbit_time)
+            else:
+                halfbit_time = (start_time + frames * frame_time) / readed_halfbits
+
+            # Record the speed of the tape
+            if readed_halfbits >= mark:
+                speed.append((self.__position, start_time / halfbit_time))
+                mark += 256
+
+            if synced:
+                yield hb
+                if double:
+                    yield hb
+            elif double:
+                synced = True
+                if lengths is not None:
+                    self.__sync_run = len(lengths) - 1
+                yield hb
+
+    def __read_bytes(self) -> Iterator[int]:
+        """
+        Reads the bytes from the WAV file by reading individual half-bits.
+
+        Every bit is the value of its first half-bit. The second half-bit of
+        the last bit in the file has no edge after it, so it is not required.
+
+        Yields:
+            int: The value of the next byte.
+        """
+        halfbits = self.__read_halfbits()
+        while 1:
+            byte = 0
+
+            # Read each bit from left to right
+            for _ in range(8):
+                bit = next(halfbits, None)
+
+                # Stop if the file ends before the byte is complete
+                if bit is None:
+                    return
+                byte = byte << 1 | bit
+
+                # Skip the second half-bit
+                next(halfbits, None)
+            yield byte
+
+    def __decode_numpy(self) -> bytes:
+        """
+        Decodes the whole WAV file at once using NumPy.
+
+        The half-bits are classified by __read_halves_numpy and packed into
+        bytes the same way as __read_halfbits and __read_bytes do it.
+
+        Returns:
+            bytes: The bytes following the synchronization.
+
+        Raises:
+            ValueError: If NumPy is not installed or there is no signal in the file.
+        """
+        numpy = _import_numpy()
+        halves = self.__read_halves_numpy(numpy)
+
+        # Synchronize on the first double half-bit
+        sync = int(numpy.argmax(halves == 2)) if len(halves) else 0
+        if not len(halves) or halves[sync] != 2:
+            raise ValueError("Unexpected end of WAV file")
+        self.__first = int(halves[:sync].sum()) + 1
+        self.__sync_run = sync
+
+        # Keep the half-bits to find the position of a byte
+        self.__halves = halves
+
+        # The values of the half-bits alternate starting from 0
+        halfbits = numpy.repeat(numpy.arange(len(halves), dtype=numpy.uint8) & 1, halves)
+
+        # Every bit is the value of its first half-bit
+        bits = halfbits[self.__first::2]
+        return numpy.packbits(bits[:len(bits) // 8 * 8]).tobytes()
+
+    def __read_halves_numpy(self, numpy) -> "numpy.ndarray":
+        """
+        Splits the file into half-bits and classifies them using NumPy.
+
+        The half-bits are classified in blocks, every block starts from the
+        state of the clock after the previous one, so the result is the same as
+        for the whole file at once. The lengths of the half-bits are kept to
+        find the frames where they start, and the half-bit times only for the
+        statistics.
+
+        Args:
+            numpy: The numpy module.
+
+        Returns:
+            numpy.ndarray: 1 for single and 2 for double half-bits.
+
+        Raises:
+            ValueError: If there is no signal in the file.
+        """
+        if self.__pulses:
+            runs, start = self.__read_pulses_numpy(numpy)
+        else:
+            runs, start = self.__read_runs_numpy(numpy)
+
+        # The first half-bit starts at the first frame that is not skipped
+        self.__lengths = runs
+        self.__base = self.__offset + start
+
+        halves = numpy.empty(len(runs), numpy.uint8)
+        if self.__report is not None:
+            self.__times = numpy.empty(len(runs))
+
+        # The state of the clock before the block
+        halfbit_time = self.__halfbit_time
+        frames = self.__frames
+        readed = self.__readed_halfbits
+        position = self.__base
+        for first in range(0, len(runs), self.NUMPY_BLOCK_SIZE):
+            block = runs[first:first + self.NUMPY_BLOCK_SIZE]
+
+            # Classify the half-bits as single or double
+            block_halves, times = self.__classify_numpy(numpy, block, halfbit_time, frames, readed)
+            halves[first:first + len(block)] = block_halves
+
+            # Keep the half-bit times before the half-bits for the statistics
+            if self.__times is not None:
+                self.__times[first] = halfbit_time
+                self.__times[first + 1:first + len(block)] = times[:-1]
+
+            # Record the speed of the tape every 256 half-bits the same way as __read_halfbits
+            readed_after = numpy.cumsum(block_halves, dtype=numpy.int64) + readed
+            ends = numpy.cumsum(block, dtype=numpy.int64) + position
+            marks = numpy.flatnonzero(readed_after // 256 > (readed_after - block_halves) // 256)
+            self.__speed += zip(ends[marks].tolist(), (self.__start_time / times[marks]).tolist())
+
+            # Carry the state of the clock to the next block
+            halfbit_time = float(times[-1])
+            frames += int(ends[-1]) - position - len(block)
+            readed = int(readed_after[-1])
+            position = int(ends[-1])
+        return halves
+
+    def __read_pulses_numpy(self, numpy) -> tuple["numpy.ndarray", int]:
+        """
+        Takes the half-bits from the pulses of the CSW file using NumPy.
+
+        Args:
+            numpy: The numpy module.
+
+        Returns:
+            tuple: The number of frames in each half-bit, and the number of the
+                frames skipped after the offset.
+
+        Raises:
+            ValueError: If there is no signal in the file.
+        """
+        pulses = numpy.frombuffer(self.__f.getpulses(), numpy.uint32)
+
+        # Find the first pulse that ends after the offset
+        first = 0
+        end = 0
+        for first in range(0, len(pulses), self.NUMPY_BLOCK_SIZE):
+            ends = numpy.cumsum(pulses[first:first + self.NUMPY_BLOCK_SIZE], dtype=numpy.int64) + end
+            if ends[-1] > self.__offset:
+                index = int(ends.searchsorted(self.__offset, "right"))
+                first += index
+                end = int(ends[index])
+                break
+            end = int(ends[-1])
+        else:
+            first = len(pulses)
+
+        # Cut the part of the first pulse before the offset
+        runs = pulses[first:].astype(numpy.int32)
+        if len(runs):
+            runs[0] = end - self.__offset
+
+        # Skip the high pulse at the start
+        start = 0
+        if len(runs) and self.__f.getpolarity() ^ self.__invert ^ (first & 1):
+            start = int(runs[0])
+            runs = runs[1:]
+        if not len(runs):
+            raise ValueError("Unexpected end of WAV file")
+        return runs, start
+
+    def __read_frames_numpy(self, numpy) -> Iterator["numpy.ndarray"]:
+        """
+        Reads the samples of the decoded channel after the offset in blocks using NumPy.
+
+        The blocks are views of the mapping converted one at a time, so the
+        memory does not grow with the length of the file.
+
+        Args:
+            numpy: The numpy module.
+
+        Yields:
+            numpy.ndarray: The samples of the next block, inverted if needed.
+        """
+        # View all frames of the WAV file as an array
+        raw = numpy.frombuffer(self.__f.getframes(), numpy.uint8)
+        if self.__sampwidth == 3:
+            frames = raw.reshape(-1, self.__channels, 3)
+        elif self.__sampwidth == 1:
+            frames = raw.reshape(-1, self.__channels)
+        else:
+            frames = raw.view(f"<i{self.__sampwidth}").reshape(-1, self.__channels)
+
+        for start in range(self.__offset, len(frames), self.NUMPY_BLOCK_SIZE):
+            block = frames[start:start + self.NUMPY_BLOCK_SIZE]
+            if self.__sampwidth == 3:
+                # Scale the 24-bit samples by 256 the same way as __convert_channel
+                wide = numpy.zeros(block.shape[:2] + (4,), numpy.uint8)
+                wide[..., 1:] = block
+                block = wide.view("<i4")[..., 0]
+
+            # Select the channel or mix all channels down
+            if self.__channel == "sum":
+                samples = block.sum(axis=1, dtype=numpy.int64)
+            else:
+                samples = block[:, self.__channel].astype(numpy.int32 if self.__sampwidth <= 2 else numpy.int64)
+            if self.__invert:
+                samples = self.__top - samples
+            yield samples
+
+            # The block is decoded, its memory is not needed anymore
+            frame_bytes = self.__channels * self.__sampwidth
+            self.__f.drop(start * frame_bytes, (start + len(block)) * frame_bytes)
+
+    def __read_runs_numpy(self, numpy) -> tuple["numpy.ndarray", int]:
+        """
+        Splits the frames of the WAV file into half-bits using NumPy.
+
+        The frames are read in blocks, and the running maximum and minimum,
+        the level and the last change of the level are carried from one block
+        to the next.
+
+        Args:
+            numpy: The numpy module.
+
+        Returns:
+            tuple: The number of frames in each half-bit, and the number of the
+                frames skipped after the offset.
+
+        Raises:
+            ValueError: If there is no signal in the file.
+        """
+        neutral = self.__neutral
+        fixed = self.__threshold == "fixed"
+        start = None  # The number of the first frame after the offset that is not greater than the neutral value
+        position = 0  # The number of the frames read after the offset
+        count = 0  # The number of the frames read after the skipped ones
+        level = False
+        last = 0
+        max_value = min_value = neutral
+        blocks = []
+        for samples in self.__read_frames_numpy(numpy):
+            position += len(samples)
+
+            # Skip any leading frames that are greater than the neutral value
+            if start is None:
+                index = int(numpy.argmax(samples <= neutral))
+                if samples[index] > neutral:
+                    continue
+                start = position - len(samples) + index
+                samples = samples[index + 1:]
+
+            if fixed:
+                levels = samples > neutral
+            elif len(samples):
+                # The neutral value is the middle between the running maximum and minimum
+                max_values = numpy.maximum.accumulate(numpy.maximum(samples, max_value))
+                min_values = numpy.minimum.accumulate(numpy.minimum(samples, min_value))
+                levels = samples > (max_values + min_values) >> 1
+                max_value = max_values[-1]
+                min_value = min_values[-1]
+            else:
+                continue
+
+            # Find the frames where the level changes, counted from 1
+            changes = numpy.flatnonzero(numpy.diff(levels, prepend=level)) + (count + 1)
+            if len(levels):
+                level = bool(levels[-1])
+            count += len(levels)
+            if len(changes):
+                blocks.append(numpy.diff(changes, prepend=last).astype(numpy.int32))
+                last = int(changes[-1])
+
+        if start is None:
+            raise ValueError("Unexpected end of WAV file")
+        return numpy.concatenate(blocks) if blocks else numpy.zeros(0, numpy.int32), start
+
+    def __classify_numpy(self, numpy, runs, halfbit_time: float, count_frames: int,
+                         readed_halfbits: int) -> tuple["numpy.ndarray", "numpy.ndarray"]:
+        """
+        Classifies the half-bits as single or double using NumPy.
+
+        A half-bit is double if it is longer than 1.5 of the mean half-bit time,
+        which depends on the classification of all previous half-bits. The
+        classification is repeated with the counts of the previous double
+        half-bits taken from the last pass until it does not change. Every
+        pass fixes at least one more half-bit, and usually a few passes are
+        enough. The arithmetic is the same as in __read_halfbits.
+
+        The "pll" clock depends on the lengths of the previous half-bits in a
+        way that can not be vectorized, so its half-bits are classified one by one.
+
+        Args:
+            numpy: The numpy module.
+            runs (numpy.ndarray): The number of frames in each half-bit.
+            halfbit_time (float): The half-bit time before the first half-bit.
+            count_frames (int): The number of frames counted by the clock before the first half-bit.
+            readed_halfbits (int): The number of half-bits read before the first half-bit.
+
+        Returns:
+            tuple: 1 for single and 2 for double half-bits, and the half-bit time
+                after each half-bit.
+        """
+        if self.__clock == "pll":
+            return self.__classify_loop(numpy, runs, halfbit_time, count_frames, readed_halfbits)
+        frame_time = self.__frame_time
+
+        # The time and the number of half-bits before each half-bit
+        frames = numpy.cumsum(runs - 1, dtype=numpy.int64) - (runs - 1) + count_frames
+        readed = numpy.arange(len(runs)) + readed_halfbits
+        time = self.__start_time + frames * frame_time
+        lengths = runs * frame_time
+
+        doubles = numpy.zeros(len(runs), bool)
+        for _ in range(32):
+            # Count the double half-bits before each half-bit
+            previous = numpy.cumsum(doubles) - doubles
+
+            # Calculate the half-bit time before each half-bit
+            times = time / (readed + previous)
+            times[:1] = halfbit_time
+
+            new_doubles = lengths > 1.5 * times
+            if numpy.array_equal(new_doubles, doubles):
+                halves = doubles.astype(numpy.uint8) + 1
+
+                # Calculate the half-bit time after each half-bit
+                readed = numpy.cumsum(halves) + readed_halfbits
+                return halves, (self.__start_time + (frames + runs - 1) * frame_time) / readed
+            doubles = new_doubles
+
+        # Classify the half-bits one by one if the passes do not converge
+        return self.__classify_loop(numpy, runs, halfbit_time, count_frames, readed_halfbits)
+
+    def __classify_loop(self, numpy, runs, halfbit_time: float, count_frames: int,
+                        readed_halfbits: int) -> tuple["numpy.ndarray", "numpy.ndarray"]:
+        """
+        Classifies the half-bits as single or double one by one.
+
+        The arithmetic is the same as in __read_halfbits.
+
+        Args:
+            numpy: The numpy module.
+            runs (numpy.ndarray): The number of frames in each half-bit.
+            halfbit_time (float): The half-bit time before the first half-bit.
+            count_frames (int): The number of frames counted by the clock before the first half-bit.
+            readed_halfbits (int): The number of half-bits read before the first half-bit.
+
+        Returns:
+            tuple: 1 for single and 2 for double half-bits, and the half-bit time
+                after each half-bit.
+        """
+        frame_time = self.__frame_time
+        pll = self.__clock == "pll"
+        gain = self.__gain
+        halves = bytearray(len(runs))
+        times = array("d", bytes(8 * len(runs)))
+        for i, count_fr in enumerate(runs.tolist()):
+            readed_halfbits += 1
+            count_frames += count_fr - 1
+            double = count_fr * frame_time > 1.5 * halfbit_time
+            if double:
+                readed_halfbits += 1
+            halves[i] = 1 + double
+            if pll:
+                halfbit_time += gain * (count_fr * frame_time / (1 + double) - halfbit_time)
+            else:
+                halfbit_time = (self.__start_time + count_frames * frame_time) / readed_halfbits
+            times[i] = halfbit_time
+        return numpy.frombuffer(halves, numpy.uint8), numpy.frombuffer(times)
+
+    def __bounds_numpy(self, numpy, indices) -> list[int]:
+        """
+        Finds the frames where the half-bits start in the numpy engine.
+
+        Args:
+            numpy: The numpy module.
+            indices (numpy.ndarray): The indices of the half-bits in ascending order,
+                the number of the half-bits for the end of the last one.
+
+        Returns:
+            list[int]: The numbers of the frames.
+        """
+        runs = self.__lengths
+        bounds = []
+        position = self.__base
+        for first in range(0, len(runs) + 1, self.NUMPY_BLOCK_SIZE):
+            block = runs[first:first + self.NUMPY_BLOCK_SIZE]
+            ends = numpy.cumsum(block, dtype=numpy.int64) + position
+            chunk = indices[(indices >= first) & (indices < first + self.NUMPY_BLOCK_SIZE)] - first
+            if len(chunk):
+                bounds += numpy.concatenate(([position], ends))[chunk].tolist()
+            if len(block):
+                position = int(ends[-1])
+        return bounds
+
+    def scan(self, leader: int = 256) -> list[tuple[int, int]]:
+        """
+        Finds the programs recorded in the WAV file.
+
+        A program starts with a leader of single half-bits followed by the
+        double half-bit of the synchronization byte, and only the leaders
+        followed by the half-bits of \xe6 are taken. The leaders are found from
+        the current position to the end of the file, including the ones inside
+        the programs, so the positions only mark where a decoding may start.
+        The run of single half-bits may begin in the last bits of the previous
+        program, so the end of the leader tells which program it belongs to.
+
+        Args:
+            leader (int, optional): The minimum number of single half-bits in the
+                leader. Defaults to 256.
+
+        Returns:
+            list[tuple[int, int]]: The numbers of the frames where the leaders start
+                and end.
+        """
+        if self.__engine == "numpy":
+            numpy = _import_numpy()
+            halves = self.__read_halves_numpy(numpy)
+
+            # Count the single half-bits before every double half-bit
+            doubles = numpy.flatnonzero(halves == 2)
+            singles = numpy.diff(doubles, prepend=-1) - 1
+            leaders = doubles[singles >= leader]
+            singles = singles[singles >= leader]
+
+            # Take the leaders followed by the synchronization byte
+            pattern = numpy.array(self.SYNC_HALVES, dtype=halves.dtype)
+            complete = leaders + len(pattern) < len(halves)
+            leaders = leaders[complete]
+            singles = singles[complete]
+            synced = (halves[leaders[:, None] + numpy.arange(1, len(pattern) + 1)] == pattern).all(axis=1)
+            leaders = leaders[synced]
+            singles = singles[synced]
+            return list(zip(self.__bounds_numpy(numpy, leaders - singles),
+                            self.__bounds_numpy(numpy, leaders)))
+
+        # Keep the state of the decoder in local variables for speed
+        frame_time = self.__frame_time
+        start_time = self.__start_time
+        halfbit_time = self.__halfbit_time
+        readed_halfbits = self.__readed_halfbits
+        frames = self.__frames
+        pll = self.__clock == "pll"
+        gain = self.__gain
+        pattern = self.SYNC_HALVES
+        position = None
+        singles = 0
+        start = 0
+        candidate = None
+        checked = 0
+        leaders = []
+
+        for count_fr in self.__runs:
+            # The first half-bit starts where the skipped frames end
+            if position is None:
+                position = self.__position
+
+            # Update the number of read half-bits and the time
+            readed_halfbits += 1
+            frames += count_fr - 1
+
+            double = count_fr * frame_time > 1.5 * halfbit_time
+
+            # Take the leader if the synchronization byte follows it
+            if candidate is not None:
+                if 1 + double != pattern[checked]:
+                    candidate = None
+                else:
+                    checked += 1
+                    if checked == len(pattern):
+                        leaders.append(candidate)
+                        candidate = None
+
+            if double:
+                readed_halfbits += 1
+
+                # A long enough run of single half-bits may be a leader
+                if singles >= leader:
+                    candidate = (start, position)
+                    checked = 0
+                singles = 0
+            else:
+                # Remember where the run of single half-bits starts
+                if not singles:
+                    start = position
+                singles += 1
+
+            # Update the half-bit time
+            if pll:
+                halfbit_time += gain * (count_fr * frame_time / (1 + double) - halfbit_time)
+            else:
+                halfbit_time = (start_time + frames * frame_time) / readed_halfbits
+            position += count_fr
+        return leaders
+
+    def tell(self) -> int:
+        """
+        Returns the position of the decoder.
+
+        Returns:
+            int: The number of the frame where the last read byte ends.
+        """
+        if self.__engine == "python" or not self.__data:
+            return self.__position
+        return self.__base + int(self.__lengths[:self.__last_run() + 1].sum(dtype="int64"))
+
+    def __last_run(self) -> int:
+        """
+        Finds the half-bit where the last read byte ends in the numpy engine.
+
+        Returns:
+            int: The index of the half-bit.
+        """
+        count = len(self.__data) - length_hint(self.__bytes)
+        halfbit = self.__first + count * 16 - 1
+
+        # Find the first half-bit that ends after the last half-bit of the byte
+        halves = self.__halves
+        total = 0
+        for first in range(0, len(halves), self.NUMPY_BLOCK_SIZE):
+            ends = halves[first:first + self.NUMPY_BLOCK_SIZE].cumsum(dtype="int64") + total
+            if ends[-1] > halfbit:
+                return first + int(ends.searchsorted(halfbit, "right"))
+            total = int(ends[-1])
+        return len(halves) - 1
+
+    def __statistics(self, end: int) -> dict:
+        """
+        Collects the statistics of the decoding.
+
+        The margin of a half-bit is the distance of its length from 1.5 of the
+        half-bit time, in half-bit times and doubled, so a half-bit of exactly
+        one or two half-bit times has the margin 1. The confidence of a byte is
+        the least margin of its half-bits. The jitter is the deviation of the
+        length of a half-bit from the half-bit time, in percent rounded to 5.
+        A half-bit longer than 2.5 half-bit times loses the bit clock, which
+        is found again on the next edges, so it is counted as a resync.
+
+        Args:
+            end (int): The number of the frame where the decoding stopped.
+
+        Returns:
+            dict: The statistics:
+                "end" (int): The number of the frame where the decoding stopped.
+                "speed" (list): The number of the frame and the speed of the tape
+                    relative to the write constant every 256 half-bits.
+                "frames" (int): The number of decoded frames.
+                "seconds" (float): The time from opening to closing the reader.
+                "frames_per_second" (float): The throughput of the decoding.
+                "confidence" (list[float]): The confidence of every decoded byte.
+                "margin" (float): The least confidence of a byte.
+                "jitter" (dict[int, int]): The number of half-bits for every deviation.
+                "resyncs" (int): The number of resyncs.
+        """
+        seconds = time.perf_counter() - self.__started
+        stats = {
+            "end": end,
+            "speed": [point for point in self.__speed if point[0] <= end],
+            "frames": end - self.__offset,
+            "seconds": seconds,
+            "frames_per_second": (end - self.__offset) / seconds if seconds else 0.0,
+            "confidence": [],
+            "margin": 1.0,
+            "jitter": {},
+            "resyncs": 0,
+        }
+        if self.__sync_run is None:
+            return stats
+
+        # Take the half-bits up to the last read byte
+        lengths = self.__lengths
+        times = self.__times
+        if self.__engine == "numpy":
+            # Convert the arrays to numbers block by block
+            count = self.__last_run() + 1
+            blocks = range(0, count, self.NUMPY_BLOCK_SIZE)
+            lengths = chain.from_iterable(self.__lengths[first:min(first + self.NUMPY_BLOCK_SIZE, count)].tolist()
+                                          for first in blocks)
+            times = chain.from_iterable(self.__times[first:min(first + self.NUMPY_BLOCK_SIZE, count)].tolist()
+                                        for first in blocks)
+
+        frame_time = self.__frame_time
+        confidence = stats["confidence"]
+        jitter = stats["jitter"]
+        halfbit = -1  # The sync half-bit is the first half of the first bit
+        for i, (count_fr, halfbit_time) in enumerate(zip(lengths, times)):
+            length = count_fr * frame_time
+            halves = 2 if length > 1.5 * halfbit_time else 1
+            margin = min(abs(length - 1.5 * halfbit_time) / (0.5 * halfbit_time), 1.0)
+
+            # Count the deviation of the half-bit and the lost bit clock
+            deviation = round((length / halves / halfbit_time - 1) * 20) * 5
+            jitter[deviation] = jitter.get(deviation, 0) + 1
+            if length > 2.5 * halfbit_time:
+                stats["resyncs"] += 1
+
+            # The bytes start from the second half of the sync half-bit
+            if i < self.__sync_run:
+                continue
+            for byte in range(max(halfbit, 0) // 16, (halfbit + halves - 1) // 16 + 1):
+                if byte == len(confidence):
+                    confidence.append(margin)
+                else:
+                    confidence[byte] = min(confidence[byte], margin)
+            halfbit += halves
+
+        # Only the complete bytes are decoded
+        del confidence[max(halfbit, 0) // 16:]
+        stats["confidence"] = [round(margin, 3) for margin in confidence]
+        stats["margin"] = min(stats["confidence"], default=1.0)
+        stats["jitter"] = dict(sorted(jitter.items()))
+        return stats
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over the bytes of the WAV file until its end.
+
+        The bytes are decoded while iterating, and the iterator is shared with
+        read() and readinto().
+
+        Returns:
+            Iterator[int]: The iterator over the values of the bytes.
+        """
+        return self.__bytes
+
+    def readinto(self, buffer: bytearray) -> int:
+        """
+        Reads bytes from the WAV file into a buffer.
+
+        Args:
+            buffer (bytearray): The buffer to fill.
+
+        Returns:
+            int: The number of bytes read, less than the size of the buffer
+                if the end of the file is reached.
+        """
+        chunk = bytes(islice(self.__bytes, len(buffer)))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    def read(self, nbytes: int = -1) -> bytes:
+        """
+        Reads the specified number of bytes from the WAV file.
+
+        Args:
+            nbytes (int, optional): The number of bytes to read. If negative,
+                all bytes until the end of the file are read. Defaults to -1.
+
+        Returns:
+            bytes: The bytes read from the WAV file.
+
+        Raises:
+            ValueError: If the end of the file is reached before nbytes are read.
+        """
+        if nbytes < 0:
+            return bytes(self.__bytes)
+
+        ans = bytes(islice(self.__bytes, nbytes))
+        if len(ans) < nbytes:
+            raise ValueError("Unexpected end of WAV file")
+        return ans
+
+    def close(self) -> None:
+        """
+        Closes the WAV file.
+
+        This function is used to close the WAV file and release any system resources
+        associated with it. It is generally not necessary to call this function, as
+        the file will be automatically closed when the object is garbage collected.
+        """
+        # Check if the file is already closed
+        if self.__is_closed:
+            # Return if the file is already closed
+            return
+
+        # Set the flag indicating that the file is closed
+        self.__is_closed = True
+
+        # Report the statistics of the decoding
+        if self.__report is not None:
+            self.__report.update(self.__statistics(self.tell()))
+
+        # Stop the decoder to release the views of the frames
+        if self.__runs is not None:
+            self.__bytes.close()
+            self.__runs.close()
+
+        # Close the WAV file unless it is shared
+        if self.__own_file:
+            self.__f.close()
+
+    def __del__(self) -> None:
+        """
+        Destructor method.
+
+        This method is automatically called when the object is about to be destroyed.
+        It is used to close the WAV file and release any system resources associated
+        with it. The close() method is called to ensure that the WAV file is properly
+        closed.
+        """
+        # Close the WAV file
+        self.close()
+
+    def __enter__(self) -> "WavReader":
+        """
+        Context manager method for with statement.
+
+        This method is used to support the with statement. It returns the WavReader
+        object itself, which allows code to be executed within the with block.
+
+        Returns:
+            WavReader: The WavReader object itself.
+        """
+        # Return the WavReader object itself
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Context manager method for with statement.
+
+        This method is used to support the with statement. It is called when the
+        with block is exited, and it is responsible for closing the WAV file.
+
+        Args:
+            *args: Variable length argument list.
+
+        Returns:
+            None
+        """
+        # Close the WAV file
+        self.close()